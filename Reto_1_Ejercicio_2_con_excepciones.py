@@ -1,3 +1,9 @@
+import codecs
+import os
+
+# los textos se comparan de a bloques: nunca se invierte mas que un bloque a la vez
+TAMANO_BLOQUE = 1 << 16
+
 class StringVacia(Exception):
     def __init__(self):
         super().__init__("cadena vacia")
@@ -12,10 +18,33 @@ def validar_entrada(palabra):
     if not palabra or palabra.isspace():
         raise StringVacia()
     
-    # Verificar que solo contenga letras (permitir espacios para frases)
-    for letra in palabra:
-        if not letra.isalpha() and not letra.isspace():
-            raise InputInvalido(letra)
+    # Verificar que solo contenga letras (permitir espacios para frases);
+    # si sin los espacios son todas letras no hace falta revisar una por una
+    if not palabra.replace(" ", "").isalpha():
+        for letra in palabra:
+            if not letra.isalpha() and not letra.isspace():
+                raise InputInvalido(letra)
+
+def normalizar(palabra):
+    return palabra.replace(" ", "").lower()
+
+def _es_palindromo_normalizado(texto):
+    # dos punteros que avanzan de a bloques desde los extremos hacia el centro
+    i = 0
+    j = len(texto)
+    while j - i > 1:
+        paso = min(TAMANO_BLOQUE, (j - i) // 2)
+        if texto[i:i + paso] != texto[j - paso:j][::-1]:
+            return False
+        i += paso
+        j -= paso
+    return True
+
+def es_palindromo(palabra):
+    if not isinstance(palabra, str):
+        raise TypeError(f"Se esperaba una cadena, se recibio: {type(palabra).__name__}")
+    validar_entrada(palabra)
+    return _es_palindromo_normalizado(normalizar(palabra))
 
 def palindromo(palabra):
     try:
@@ -27,22 +56,145 @@ def palindromo(palabra):
         validar_entrada(palabra)
         
         # volver minuscula las palabras
-        palabra_en_minuscula = palabra.replace(" ", "").lower()
-        
-        # Construir palabra invertida
-        palabra_invertida = ""
-        for i in range(len(palabra_en_minuscula)-1, -1, -1):
-            palabra_invertida += palabra_en_minuscula[i]
+        palabra_en_minuscula = normalizar(palabra)
         
         # Verificar si es palíndromo
-        es_palindromo = (palabra_en_minuscula == palabra_invertida)
+        resultado = _es_palindromo_normalizado(palabra_en_minuscula)
+        
+        # Construir palabra invertida
+        palabra_invertida = palabra_en_minuscula[::-1]
         
-        return es_palindromo, palabra_invertida
+        return resultado, palabra_invertida
         
     except (StringVacia, InputInvalido, TypeError) as error:
         print(f"Error de validacion: {error}")
         raise
 
+def palindromos(frases):
+    # una respuesta por frase; las frases invalidas dan None y una advertencia, sin cortar el lote
+    resultados = []
+    for frase in frases:
+        try:
+            resultados.append(es_palindromo(frase))
+        except (StringVacia, InputInvalido, TypeError) as error:
+            print(f"Advertencia: frase {frase!r} ignorada - {error}")
+            resultados.append(None)
+    return resultados
+
+def _normalizar_bloque(texto):
+    # en un archivo todo espacio en blanco, incluidos los saltos de linea, separa palabras y se ignora
+    letras = "".join(texto.split())
+    if not letras.isalpha():
+        for letra in letras:
+            if not letra.isalpha():
+                raise InputInvalido(letra)
+    return letras.lower()
+
+def _desde_el_final(archivo, inicio, fin, tamano_bloque):
+    # bytes [desde, fin) con desde >= inicio, empezando en el primer byte de un caracter UTF-8
+    desde = max(inicio, fin - tamano_bloque)
+    archivo.seek(desde)
+    datos = archivo.read(fin - desde)
+    corte = 0
+    # los bytes de continuacion del principio son del caracter que esta leyendo el lado de adelante
+    while corte < len(datos) and datos[corte] & 0xC0 == 0x80:
+        corte += 1
+    return desde + corte, datos[corte:]
+
+def palindromo_archivo(ruta, tamano_bloque = TAMANO_BLOQUE):
+    # el archivo tiene que estar en UTF-8: el lado de atras reconoce donde empieza cada caracter.
+    # lee el archivo de a bloques desde el principio y desde el final, sin cargarlo entero;
+    # cada byte se lee una sola vez y se compara apenas hay texto de los dos lados
+    if tamano_bloque < 4:
+        raise ValueError("El tamano de bloque debe ser de al menos 4 bytes")
+    decodificador = codecs.getincrementaldecoder("utf-8")()
+    with open(ruta, "rb") as archivo:
+        adelante = 0
+        atras = os.fstat(archivo.fileno()).st_size
+        frente = ""
+        fondo = ""
+        letras = 0
+        while True:
+            # se lee del lado que tiene menos texto pendiente mientras queden bytes en el medio
+            if adelante < atras and len(frente) <= len(fondo):
+                archivo.seek(adelante)
+                datos = archivo.read(min(tamano_bloque, atras - adelante))
+                adelante += len(datos)
+                frente += _normalizar_bloque(decodificador.decode(datos, final=adelante == atras))
+            elif adelante < atras:
+                nuevo_atras, datos = _desde_el_final(archivo, adelante, atras, tamano_bloque)
+                if not datos:
+                    # no entra un caracter completo del lado de atras: que avance el de adelante
+                    archivo.seek(adelante)
+                    datos = archivo.read(atras - adelante)
+                    adelante = atras
+                    frente += _normalizar_bloque(decodificador.decode(datos, final=True))
+                else:
+                    atras = nuevo_atras
+                    fondo = _normalizar_bloque(datos.decode("utf-8")) + fondo
+            else:
+                # un archivo que termina a mitad de un caracter falla aca
+                decodificador.decode(b"", final=True)
+                break
+            paso = min(len(frente), len(fondo))
+            if paso:
+                if frente[:paso] != fondo[len(fondo) - paso:][::-1]:
+                    return False
+                letras += 2 * paso
+                frente = frente[paso:]
+                fondo = fondo[:len(fondo) - paso]
+        # lo que queda sin comparar es el centro del texto
+        centro = frente + fondo
+        if letras + len(centro) == 0:
+            raise StringVacia()
+        return _es_palindromo_normalizado(centro)
+
+def palindromo_mas_largo(palabra):
+    # Manacher sobre el texto normalizado: el palindromo mas largo en O(n)
+    if not isinstance(palabra, str):
+        raise TypeError(f"Se esperaba una cadena, se recibio: {type(palabra).__name__}")
+    validar_entrada(palabra)
+    return _manacher(normalizar(palabra))
+
+def palindromo_mas_largo_archivo(ruta, tamano_bloque = TAMANO_BLOQUE):
+    # el texto normalizado (UTF-8) tiene que estar entero en memoria, pero se arma de a bloques
+    decodificador = codecs.getincrementaldecoder("utf-8")()
+    partes = []
+    with open(ruta, "rb") as archivo:
+        while True:
+            datos = archivo.read(tamano_bloque)
+            partes.append(_normalizar_bloque(decodificador.decode(datos, final=not datos)))
+            if not datos:
+                break
+    texto = "".join(partes)
+    if not texto:
+        raise StringVacia()
+    return _manacher(texto)
+
+def _manacher(texto):
+    # radios[i] es el radio del palindromo centrado en la posicion i de "#a#b#...#"
+    n = 2 * len(texto) + 1
+    radios = [0] * n
+    centro = 0
+    derecha = 0
+    mejor = 0
+    mejor_centro = 0
+    for i in range(n):
+        radio = min(radios[2 * centro - i], derecha - i) if i < derecha else 0
+        # las posiciones pares son separadores, las impares son texto[(posicion - 1) // 2]
+        while i - radio - 1 >= 0 and i + radio + 1 < n and (
+                (i - radio - 1) % 2 == 0 or texto[(i - radio - 2) // 2] == texto[(i + radio) // 2]):
+            radio += 1
+        radios[i] = radio
+        if i + radio > derecha:
+            centro = i
+            derecha = i + radio
+        if radio > mejor:
+            mejor = radio
+            mejor_centro = i
+    inicio = (mejor_centro - mejor) // 2
+    return texto[inicio:inicio + mejor]
+
 def obtener_palabra():
     while True:
         try:
@@ -1,3 +1,41 @@
+import os
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from itertools import compress
+from math import isqrt, log
+from operator import index
+from random import Random
+
+# la criba recorre [0, max] en segmentos de este tamano, asi la memoria no depende de max
+TAMANO_SEGMENTO = 1 << 20
+
+# bytes en cero para tachar con una vista, sin crear un bytes nuevo por cada primo
+_CEROS = memoryview(bytes(TAMANO_SEGMENTO))
+
+# primos para el filtro por division; un numero menor que 101 ** 2 que pasa el filtro es primo
+PRIMOS_PEQUENOS = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53, 59, 61, 67, 71, 73, 79, 83, 89, 97)
+LIMITE_FILTRO = 101 * 101
+
+# Miller-Rabin determinista: con las bases de la fila alcanza para todo numero menor que el limite
+BASES_MILLER_RABIN = (
+    (1373653, (2, 3)),
+    (25326001, (2, 3, 5)),
+    (3215031751, (2, 3, 5, 7)),
+    (2152302898747, (2, 3, 5, 7, 11)),
+    (3474749660383, (2, 3, 5, 7, 11, 13)),
+    (341550071728321, (2, 3, 5, 7, 11, 13, 17)),
+    (3825123056546413051, (2, 3, 5, 7, 11, 13, 17, 19, 23)),
+    (318665857834031151167461, (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)),
+    (3317044064679887385961981, (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)),
+)
+
+# por encima de la tabla no hay bases deterministas conocidas: se suman bases elegidas a partir
+# del propio numero, cada una deja pasar un compuesto con probabilidad menor que 1/4
+BASES_EXTRA = 20
+
+# con menos numeros distintos que esto arrancar el pool de procesos cuesta mas de lo que ahorra
+UMBRAL_PARALELO = 100000
+TAMANO_BLOQUE = 20000
 
 class ListaVaciaError(Exception):
     def __init__(self):
@@ -16,6 +54,11 @@ def validar_lista_numeros(lista):
         raise ListaVaciaError()
     
     for i, elemento in enumerate(lista):
+        # los enteros no necesitan conversion
+        if type(elemento) is int:
+            if elemento < 0:
+                raise NumeroInvalidoError(elemento)
+            continue
         try:
             #convertir a entero
             numero = int(elemento)
@@ -28,24 +71,127 @@ def validar_lista_numeros(lista):
         except (ValueError, TypeError):
             raise NumeroInvalidoError(elemento)
 
+def _bases_miller_rabin(numero):
+    for limite, bases in BASES_MILLER_RABIN:
+        if numero < limite:
+            return bases
+    rng = Random(numero)
+    return BASES_MILLER_RABIN[-1][1] + tuple(rng.randrange(2, numero - 1) for _ in range(BASES_EXTRA))
+
+def miller_rabin(numero):
+    # numero impar, mayor que 2 y sin factores en PRIMOS_PEQUENOS
+    d = numero - 1
+    s = 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for base in _bases_miller_rabin(numero):
+        x = pow(base, d, numero)
+        if x == 1 or x == numero - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % numero
+            if x == numero - 1:
+                break
+        else:
+            return False
+    return True
+
 def es_primo(numero):
     try:
+        # Un float entero se trata como el entero que representa
+        if type(numero) is not int:
+            numero = int(numero) if isinstance(numero, float) and numero.is_integer() else index(numero)
+        
         # Casos especiales
         if numero < 2:
             return False
-        if numero == 2:
+        
+        # Filtro por division con primos pequenos
+        for primo in PRIMOS_PEQUENOS:
+            if numero % primo == 0:
+                return numero == primo
+        if numero < LIMITE_FILTRO:
             return True
-        if numero % 2 == 0:
-            return False
-
-        for i in range(3, int(numero**0.5) + 1, 2):
-            if numero % i == 0:
-                return False
-        return True
+        
+        return miller_rabin(numero)
     except Exception as e:
         raise NumeroInvalidoError(f"Error al verificar primalidad de {numero}: {e}")
 
-def devolver_primos(lista):
+def primos_hasta(limite):
+    # criba de Eratostenes simple, criba[i] vale 1 si i es primo
+    if limite < 2:
+        return []
+    criba = bytearray([1]) * (limite + 1)
+    criba[0] = criba[1] = 0
+    for i in range(2, isqrt(limite) + 1):
+        if criba[i]:
+            criba[i * i::i] = bytes(len(range(i * i, limite + 1, i)))
+    return list(compress(range(limite + 1), criba))
+
+def criba_segmentada(numeros):
+    # numeros: enteros distintos, no negativos y ordenados; devuelve los que son primos
+    if not numeros:
+        return []
+    maximo = numeros[-1]
+    base = primos_hasta(isqrt(maximo))
+    primos = []
+    i = bisect_left(numeros, 2)
+    while i < len(numeros):
+        # se criba solo el segmento donde cae el siguiente numero, los segmentos vacios se saltan
+        inicio = numeros[i] - numeros[i] % TAMANO_SEGMENTO
+        fin = min(inicio + TAMANO_SEGMENTO, maximo + 1)
+        largo = fin - inicio
+        segmento = bytearray([1]) * largo
+        for primo in base:
+            if primo * primo >= fin:
+                break
+            primero = max(primo * primo, inicio + -inicio % primo) - inicio
+            if primero < largo:
+                segmento[primero::primo] = _CEROS[:(largo - primero - 1) // primo + 1]
+        while i < len(numeros) and numeros[i] < fin:
+            if segmento[numeros[i] - inicio]:
+                primos.append(numeros[i])
+            i += 1
+    return primos
+
+def conviene_criba(cantidad, maximo):
+    # tiempos aproximados en microsegundos: cada segmento que la criba toca cuesta 0.5 por primo
+    # base (el ciclo en Python) y 0.004 por byte (el tachado en C); es_primo crece con el cuadrado
+    # de la cantidad de bits por las potencias modulares de Miller-Rabin
+    if maximo < 2:
+        return False
+    segmentos = min(cantidad, maximo // TAMANO_SEGMENTO + 1)
+    raiz = isqrt(maximo)
+    primos_base = raiz / max(1.0, log(raiz + 1))
+    costo_criba = segmentos * (0.5 * primos_base + 0.004 * min(TAMANO_SEGMENTO, maximo + 1))
+    costo_individual = cantidad * (0.5 + 0.5 * (maximo.bit_length() / 20) ** 2)
+    return costo_criba < costo_individual
+
+def filtrar_primos(numeros):
+    # devuelve los primos de numeros, en el mismo orden, y las advertencias de los que no se pudieron verificar
+    primos = []
+    advertencias = []
+    for numero in numeros:
+        try:
+            if es_primo(numero):
+                primos.append(numero)
+        except NumeroInvalidoError as e:
+            advertencias.append(str(e))
+    return primos, advertencias
+
+def filtrar_primos_paralelo(numeros, procesos = None, tamano_bloque = TAMANO_BLOQUE):
+    # numeros ordenados: cada bloque devuelve sus primos ordenados y basta con concatenarlos en orden
+    bloques = [numeros[i:i + tamano_bloque] for i in range(0, len(numeros), tamano_bloque)]
+    primos = []
+    advertencias = []
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        for primos_bloque, advertencias_bloque in pool.map(filtrar_primos, bloques):
+            primos.extend(primos_bloque)
+            advertencias.extend(advertencias_bloque)
+    return primos, advertencias
+
+def devolver_primos(lista, procesos = None):
     try:
         # Crear una copia para no modificar la lista original
         lista_copia = lista.copy()
@@ -53,26 +199,25 @@ def devolver_primos(lista):
         # Validar la lista
         validar_lista_numeros(lista_copia)
         
-        # Encontrar números primos
-        primos = []
-        numeros_procesados = set()  # Para evitar duplicados
+        # Cada número se procesa una sola vez
+        numeros = sorted(set(lista_copia))
         
-        for numero in lista_copia:
-            # Evitar procesar el mismo número múltiples veces
-            if numero in numeros_procesados:
-                continue
-                
-            numeros_procesados.add(numero)
-            
-            try:
-                if es_primo(numero):
-                    primos.append(numero)
-            except NumeroInvalidoError as e:
-                print(f"Advertencia: {e}")
-                continue
+        # Con muchos números en un rango acotado conviene cribar hasta el máximo
+        if conviene_criba(len(numeros), numeros[-1]):
+            return criba_segmentada(numeros)
+        
+        # Encontrar números primos uno por uno, ya quedan ordenados; con muchos números
+        # se reparten en bloques entre varios procesos (procesos=1 fuerza el modo serial)
+        if procesos is None:
+            procesos = os.cpu_count() or 1
+        if procesos > 1 and len(numeros) >= UMBRAL_PARALELO:
+            primos, advertencias = filtrar_primos_paralelo(numeros, procesos)
+        else:
+            primos, advertencias = filtrar_primos(numeros)
+        
+        for advertencia in advertencias:
+            print(f"Advertencia: {advertencia}")
         
-        # Ordenar los primos encontrados
-        primos.sort()
         return primos
         
     except (TypeError, ListaVaciaError, NumeroInvalidoError, NumeroInvalidoError) as e:
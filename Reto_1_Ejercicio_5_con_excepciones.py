@@ -1,3 +1,8 @@
+import hashlib
+import mmap
+import os
+import struct
+
 class ListaVaciaError(Exception):
     def __init__(self):
         super().__init__("No se puede procesar una lista vacia")
@@ -19,10 +24,11 @@ def validar_palabra(palabra):
     if not palabra or palabra.isspace():
         raise StringVaciaError()
     
-    # Permitir solo letras y espacios
-    for letra in palabra:
-        if not letra.isalpha() and not letra.isspace():
-            raise PalabraInvalidaError(palabra, f"contiene el caracter invalido '{letra}'")
+    # Permitir solo letras y espacios; si son todas letras no hace falta revisar una por una
+    if not palabra.isalpha():
+        for letra in palabra:
+            if not letra.isalpha() and not letra.isspace():
+                raise PalabraInvalidaError(palabra, f"contiene el caracter invalido '{letra}'")
     
     # Verificar que no sea solo espacios después de strip
     if not palabra.strip():
@@ -45,6 +51,18 @@ def validar_lista_palabras(lista_palabras):
 def normalizar_palabra(palabra):
     return palabra.replace(" ", "").lower().strip()
 
+def firma_anagrama(palabra):
+    # dos palabras son anagramas si y solo si tienen la misma firma
+    return ''.join(sorted(normalizar_palabra(palabra)))
+
+def agrupar_anagramas(palabras):
+    # un solo recorrido: cada palabra va al grupo de su firma; los grupos quedan en el orden
+    # de su primera palabra y dentro de cada grupo las palabras quedan en el orden de entrada
+    grupos = {}
+    for palabra in palabras:
+        grupos.setdefault(firma_anagrama(palabra), []).append(palabra)
+    return [grupo for grupo in grupos.values() if len(grupo) > 1]
+
 def tienen_mismos_caracteres(palabra1, palabra2):
     try:
         # Normalizar ambas palabras
@@ -61,66 +79,261 @@ def tienen_mismos_caracteres(palabra1, palabra2):
     except Exception as error:
         raise PalabraInvalidaError(f"{palabra1}, {palabra2}", f"error al comparar: {error}")
 
-def mismos_caracteres(lista_palabras):
+def mismos_caracteres_con_grupos(lista_palabras):
     try:
         # Validar la lista de entrada
         validar_lista_palabras(lista_palabras)
         
-        # Limpiar y normalizar la lista
+        # Limpiar la lista, todas las palabras ya estan validadas
         palabras_validas = []
         palabras_procesadas = set()
         
         for palabra in lista_palabras:
-            try:
-                validar_palabra(palabra)
-                palabra_normalizada = normalizar_palabra(palabra)
-                
-                # Evitar duplicados exactos
-                if palabra_normalizada not in palabras_procesadas:
-                    palabras_validas.append(palabra.strip())
-                    palabras_procesadas.add(palabra_normalizada)
-                    
-            except (StringVaciaError, PalabraInvalidaError) as error:
-                print(f"Advertencia: Palabra '{palabra}' ignorada - {error}")
-                continue
+            palabra_normalizada = normalizar_palabra(palabra)
+            
+            # Evitar duplicados exactos
+            if palabra_normalizada not in palabras_procesadas:
+                palabras_validas.append(palabra.strip())
+                palabras_procesadas.add(palabra_normalizada)
         
         if not palabras_validas:
             raise ListaVaciaError()
         
-        # Encontrar anagramas
-        palabras_con_anagramas = []
-        palabras_ya_procesadas = set()
+        # Encontrar anagramas agrupando por firma
+        grupos = agrupar_anagramas(palabras_validas)
+        palabras_con_anagramas = [palabra for grupo in grupos for palabra in grupo]
         
-        for i in range(len(palabras_validas)):
-            if palabras_validas[i] in palabras_ya_procesadas:
-                continue
-                
-            # Buscar anagramas de esta palabra
-            for j in range(i + 1, len(palabras_validas)):
-                if palabras_validas[j] in palabras_ya_procesadas:
-                    continue
-                    
-                try:
-                    if tienen_mismos_caracteres(palabras_validas[i], palabras_validas[j]):
-                        # Agregar ambas palabras si no están ya en la lista
-                        if palabras_validas[i] not in palabras_con_anagramas:
-                            palabras_con_anagramas.append(palabras_validas[i])
-                        if palabras_validas[j] not in palabras_con_anagramas:
-                            palabras_con_anagramas.append(palabras_validas[j])
-                        
-                        palabras_ya_procesadas.add(palabras_validas[i])
-                        palabras_ya_procesadas.add(palabras_validas[j])
-                        
-                except PalabraInvalidaError as error:
-                    print(f"Advertencia: Error al comparar palabras - {error}")
-                    continue
-        
-        return palabras_con_anagramas
+        return palabras_con_anagramas, grupos
         
     except (TypeError, ListaVaciaError, PalabraInvalidaError) as error:
         print(f"Error de validacion: {error}")
         raise
 
+def mismos_caracteres(lista_palabras):
+    palabras_con_anagramas, grupos = mismos_caracteres_con_grupos(lista_palabras)
+    return palabras_con_anagramas
+
+class IndiceInvalidoError(Exception):
+    def __init__(self, ruta, razon):
+        self.ruta = ruta
+        self.razon = razon
+        super().__init__(f"Indice invalido '{ruta}': {razon}")
+
+# formato en disco: cabecera, tabla hash de direccionamiento abierto y los grupos uno detras de otro
+#   cabecera: magic, version, reservado (0), cantidad de casillas, cantidad de grupos, cantidad de palabras
+#             y largo de la seccion de grupos, para detectar un archivo truncado
+#   casilla:  hash de la firma (0 = vacia) y posicion del grupo en el archivo
+#   grupo:    largo y bytes de la firma, cantidad de palabras, y largo y bytes de cada palabra (UTF-8)
+MAGIC_INDICE = b'ANAG'
+VERSION_INDICE = 2
+CABECERA = struct.Struct('<4sHHQQQQ')
+CASILLA = struct.Struct('<QQ')
+ENTERO = struct.Struct('<I')
+
+def _hash_firma(firma):
+    # estable entre ejecuciones (hash() de str no lo es); 0 queda reservado para las casillas vacias
+    valor = int.from_bytes(hashlib.blake2b(firma.encode('utf-8'), digest_size=8).digest(), 'little')
+    return valor or 1
+
+class AnagramIndex:
+    def __init__(self, palabras = None):
+        # grupos en memoria: firma -> {palabra normalizada: palabra}; con un archivo abierto
+        # guardan solo lo agregado despues de abrirlo
+        self._grupos = {}
+        self._eliminadas = set()
+        self._cantidad = 0
+        self._archivo = None
+        self._mapa = None
+        self._ruta = None
+        self._casillas = 0
+        if palabras is not None:
+            for palabra in palabras:
+                self.add(palabra)
+    def _grupo_en_disco(self, firma):
+        if self._mapa is None:
+            return []
+        codificada = firma.encode('utf-8')
+        hash_firma = _hash_firma(firma)
+        mascara = self._casillas - 1
+        casilla = hash_firma & mascara
+        try:
+            for _ in range(self._casillas):
+                hash_casilla, posicion = CASILLA.unpack_from(self._mapa, CABECERA.size + casilla * CASILLA.size)
+                if hash_casilla == 0:
+                    return []
+                if hash_casilla == hash_firma:
+                    largo, = ENTERO.unpack_from(self._mapa, posicion)
+                    if self._mapa[posicion + 4:posicion + 4 + largo] == codificada:
+                        return self._leer_palabras(posicion + 4 + largo)[0]
+                casilla = (casilla + 1) & mascara
+        except (struct.error, UnicodeDecodeError):
+            raise IndiceInvalidoError(self._ruta, "datos corruptos")
+        raise IndiceInvalidoError(self._ruta, "tabla sin casillas vacias")
+    def _leer_palabras(self, posicion):
+        cantidad, = ENTERO.unpack_from(self._mapa, posicion)
+        posicion += 4
+        palabras = []
+        for _ in range(cantidad):
+            largo, = ENTERO.unpack_from(self._mapa, posicion)
+            palabras.append(self._mapa[posicion + 4:posicion + 4 + largo].decode('utf-8'))
+            posicion += 4 + largo
+        return palabras, posicion
+    def _en_disco(self, normalizada, firma):
+        if normalizada in self._eliminadas:
+            return False
+        return any(normalizar_palabra(palabra) == normalizada for palabra in self._grupo_en_disco(firma))
+    def _visibles(self, palabras):
+        # las palabras del disco que no se eliminaron
+        if not self._eliminadas:
+            return palabras
+        return [palabra for palabra in palabras if normalizar_palabra(palabra) not in self._eliminadas]
+    def _grupos_en_disco(self):
+        if self._mapa is None:
+            return
+        _, _, _, _, grupos, _, _ = CABECERA.unpack_from(self._mapa, 0)
+        posicion = CABECERA.size + self._casillas * CASILLA.size
+        for _ in range(grupos):
+            try:
+                largo, = ENTERO.unpack_from(self._mapa, posicion)
+                firma = self._mapa[posicion + 4:posicion + 4 + largo].decode('utf-8')
+                palabras, posicion = self._leer_palabras(posicion + 4 + largo)
+            except (struct.error, UnicodeDecodeError):
+                raise IndiceInvalidoError(self._ruta, "datos corruptos")
+            yield firma, palabras
+    def _preparar(self, palabra):
+        validar_palabra(palabra)
+        return normalizar_palabra(palabra), firma_anagrama(palabra)
+    def add(self, palabra):
+        # devuelve False si la palabra (normalizada) ya estaba
+        normalizada, firma = self._preparar(palabra)
+        if normalizada in self._grupos.get(firma, ()):
+            return False
+        if self._en_disco(normalizada, firma):
+            return False
+        # una palabra del disco que se elimino y se vuelve a agregar queda en memoria con la forma nueva
+        self._grupos.setdefault(firma, {})[normalizada] = palabra.strip()
+        self._cantidad += 1
+        return True
+    def remove(self, palabra):
+        # devuelve False si la palabra no estaba
+        normalizada, firma = self._preparar(palabra)
+        grupo = self._grupos.get(firma)
+        if grupo and normalizada in grupo:
+            del grupo[normalizada]
+            if not grupo:
+                del self._grupos[firma]
+        elif self._en_disco(normalizada, firma):
+            self._eliminadas.add(normalizada)
+        else:
+            return False
+        self._cantidad -= 1
+        return True
+    def lookup(self, palabra):
+        # todas las palabras con la misma firma, incluida la consultada si esta en el indice
+        _, firma = self._preparar(palabra)
+        palabras = self._visibles(self._grupo_en_disco(firma))
+        palabras.extend(self._grupos.get(firma, {}).values())
+        return palabras
+    def anagramas(self, palabra):
+        normalizada = normalizar_palabra(palabra)
+        return [otra for otra in self.lookup(palabra) if normalizar_palabra(otra) != normalizada]
+    def __contains__(self, palabra):
+        try:
+            normalizada, firma = self._preparar(palabra)
+        except (TypeError, StringVaciaError, PalabraInvalidaError):
+            return False
+        if normalizada in self._grupos.get(firma, ()):
+            return True
+        return self._en_disco(normalizada, firma)
+    def __len__(self):
+        return self._cantidad
+    def _todos_los_grupos(self):
+        vistas = set()
+        for firma, palabras in self._grupos_en_disco():
+            vistas.add(firma)
+            grupo = self._visibles(palabras)
+            grupo.extend(self._grupos.get(firma, {}).values())
+            if grupo:
+                yield firma, grupo
+        for firma, palabras in self._grupos.items():
+            if firma not in vistas:
+                yield firma, list(palabras.values())
+    def grupos(self):
+        # los grupos con al menos dos palabras, como agrupar_anagramas
+        return [grupo for firma, grupo in self._todos_los_grupos() if len(grupo) > 1]
+    def save(self, ruta):
+        grupos = list(self._todos_los_grupos())
+        casillas = 1
+        while casillas < 2 * len(grupos):
+            casillas *= 2
+        tabla = bytearray(casillas * CASILLA.size)
+        datos = bytearray()
+        inicio_datos = CABECERA.size + len(tabla)
+        for firma, palabras in grupos:
+            hash_firma = _hash_firma(firma)
+            casilla = hash_firma & (casillas - 1)
+            while CASILLA.unpack_from(tabla, casilla * CASILLA.size)[0] != 0:
+                casilla = (casilla + 1) & (casillas - 1)
+            CASILLA.pack_into(tabla, casilla * CASILLA.size, hash_firma, inicio_datos + len(datos))
+            codificada = firma.encode('utf-8')
+            datos += ENTERO.pack(len(codificada)) + codificada + ENTERO.pack(len(palabras))
+            for palabra in palabras:
+                codificada = palabra.encode('utf-8')
+                datos += ENTERO.pack(len(codificada)) + codificada
+        # se escribe aparte y se reemplaza, asi se puede guardar sobre el archivo que esta abierto
+        temporal = f"{ruta}.tmp"
+        with open(temporal, 'wb') as archivo:
+            archivo.write(CABECERA.pack(MAGIC_INDICE, VERSION_INDICE, 0, casillas, len(grupos), self._cantidad, len(datos)))
+            archivo.write(tabla)
+            archivo.write(datos)
+        os.replace(temporal, ruta)
+    @classmethod
+    def load(cls, ruta):
+        indice = cls()
+        archivo = open(ruta, 'rb')
+        try:
+            if os.fstat(archivo.fileno()).st_size < CABECERA.size:
+                raise IndiceInvalidoError(ruta, "archivo demasiado corto")
+            mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        except BaseException:
+            archivo.close()
+            raise
+        magic, version, _, casillas, grupos, cantidad, largo_datos = CABECERA.unpack_from(mapa, 0)
+        if magic != MAGIC_INDICE or version != VERSION_INDICE:
+            mapa.close()
+            archivo.close()
+            raise IndiceInvalidoError(ruta, "no es un indice de anagramas de esta version")
+        if casillas == 0 or casillas & (casillas - 1):
+            mapa.close()
+            archivo.close()
+            raise IndiceInvalidoError(ruta, "cantidad de casillas invalida")
+        if len(mapa) != CABECERA.size + casillas * CASILLA.size + largo_datos:
+            mapa.close()
+            archivo.close()
+            raise IndiceInvalidoError(ruta, "archivo truncado")
+        indice._archivo = archivo
+        indice._ruta = ruta
+        indice._mapa = mapa
+        indice._casillas = casillas
+        indice._cantidad = cantidad
+        return indice
+    def close(self):
+        # libera el archivo; el indice sigue usable solo con lo agregado despues de abrirlo
+        if self._mapa is not None:
+            self._mapa.close()
+            self._archivo.close()
+            self._mapa = None
+            self._archivo = None
+            self._ruta = None
+            self._eliminadas = set()
+            self._cantidad = sum(len(grupo) for grupo in self._grupos.values())
+    def __enter__(self):
+        return self
+    def __exit__(self, *exc):
+        self.close()
+    def __str__(self):
+        return f"AnagramIndex(palabras={len(self)})"
+
 if __name__ == '__main__':
     try:
         # Lista de demostración
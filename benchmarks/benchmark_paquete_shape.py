@@ -0,0 +1,241 @@
+"""
+Benchmarks de los caminos calientes de paquete_shape.
+
+Uso:
+    python benchmarks/benchmark_paquete_shape.py --escalas 1000 10000
+    python benchmarks/benchmark_paquete_shape.py --guardar-baseline benchmarks/baseline.json
+    python benchmarks/benchmark_paquete_shape.py --baseline benchmarks/baseline.json --umbral 0.2
+
+Con --baseline el proceso termina con codigo 1 si algun caso pierde mas del
+umbral de ops/seg respecto al baseline guardado.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from paquete_shape import Point, PointArray, Line, Rectangle, Triangle, GridIndex, SweepAndPrune, TriangleBatch
+
+TAMANO_ESCENA = 1000.0
+
+# generadores de escenas sinteticas, deterministas por semilla
+
+def generar_puntos(n, semilla = 0):
+    rng = random.Random(semilla)
+    return [Point(rng.uniform(0, TAMANO_ESCENA), rng.uniform(0, TAMANO_ESCENA)) for _ in range(n)]
+
+def generar_lineas(n, largo = 50.0, semilla = 0):
+    rng = random.Random(semilla)
+    lineas = []
+    for _ in range(n):
+        x = rng.uniform(0, TAMANO_ESCENA)
+        y = rng.uniform(0, TAMANO_ESCENA)
+        lineas.append(Line(Point(x, y), Point(x + rng.uniform(1, largo), y + rng.uniform(-largo, largo))))
+    return lineas
+
+def rectangulo(x, y, ancho, alto):
+    a = Point(x, y)
+    b = Point(x + ancho, y)
+    c = Point(x + ancho, y + alto)
+    d = Point(x, y + alto)
+    return Rectangle([Line(a, b), Line(b, c), Line(c, d), Line(d, a)])
+
+def generar_rectangulos(n, semilla = 0):
+    rng = random.Random(semilla)
+    # lado medio escalado para mantener una densidad de solapes parecida en todas las escalas
+    lado = TAMANO_ESCENA / max(n, 1) ** 0.5
+    return [rectangulo(rng.uniform(0, TAMANO_ESCENA), rng.uniform(0, TAMANO_ESCENA),
+                       rng.uniform(0.2, 1.5) * lado, rng.uniform(0.2, 1.5) * lado) for _ in range(n)]
+
+def generar_triangulos(n, semilla = 0):
+    rng = random.Random(semilla)
+    triangulos = []
+    for _ in range(n):
+        x = rng.uniform(0, TAMANO_ESCENA)
+        y = rng.uniform(0, TAMANO_ESCENA)
+        a = Point(x, y)
+        b = Point(x + rng.uniform(1, 10), y + rng.uniform(-1, 1))
+        c = Point(x + rng.uniform(-5, 5), y + rng.uniform(1, 10))
+        triangulos.append(Triangle([Line(a, b), Line(b, c), Line(c, a)]))
+    return triangulos
+
+# casos: construir(n) prepara la escena fuera de la medicion; llamar(estado, i) hace una llamada
+# que procesa items_por_llamada(n) elementos
+
+class Caso:
+    def __init__(self, nombre, construir, llamar, por_lote = False):
+        self.nombre = nombre
+        self.construir = construir
+        self.llamar = llamar
+        self.por_lote = por_lote
+
+def _distancia_escalar(puntos, i):
+    puntos[i].distance_to(puntos[i - 1])
+
+def _distancia_lote(estado, i):
+    arreglo, origen = estado
+    arreglo.distance_to(origen)
+
+def _rango_linea(lineas, i):
+    lineas[i].range_of_the_line()
+
+def _rasterizar(lineas, i):
+    for _ in lineas[i].rasterize("bresenham"):
+        pass
+
+def _interferencia_rectangulos(rectangulos, i):
+    rectangulos[i].compute_interference_between_2_rectangles(rectangulos[i - 1])
+
+def _interferencia_punto(estado, i):
+    rectangulos, puntos = estado
+    rectangulos[i].compute_interferece_between_rectangle_and_point(puntos[i])
+
+def _cruce_rectangulos(rectangulos, i):
+    rectangulos[i].intersects_with_rectangle(rectangulos[i - 1])
+
+def _interferencia_linea(estado, i):
+    rectangulos, lineas = estado
+    rectangulos[i].compute_interference_between_rectangle_and_line(lineas[i])
+
+def _consulta_indice(estado, i):
+    indice, rectangulos = estado
+    indice.query_rectangle(rectangulos[i])
+
+def _sweep_and_prune(rectangulos, i):
+    SweepAndPrune().overlapping_pairs(rectangulos)
+
+def _metricas_triangulo(triangulos, i):
+    triangulo = triangulos[i]
+    triangulo.invalidate()
+    triangulo.compute_perimeter()
+    triangulo.compute_area()
+    triangulo.compute_inner_angles()
+
+def _metricas_lote(lote, i):
+    lote.compute_perimeters()
+    lote.compute_areas()
+    lote.compute_inner_angles()
+
+def _construir_indice(n):
+    rectangulos = generar_rectangulos(n)
+    return GridIndex(rectangulos), rectangulos
+
+CASOS = [
+    Caso("point.distance_to", generar_puntos, _distancia_escalar),
+    Caso("point_array.distance_to", lambda n: (PointArray.from_points(generar_puntos(n)), Point(0, 0)), _distancia_lote, por_lote=True),
+    Caso("line.range_of_the_line", generar_lineas, _rango_linea),
+    Caso("line.rasterize", generar_lineas, _rasterizar),
+    Caso("rectangle.interference_rectangles", generar_rectangulos, _interferencia_rectangulos),
+    Caso("rectangle.interference_point", lambda n: (generar_rectangulos(n), generar_puntos(n, semilla=1)), _interferencia_punto),
+    Caso("rectangle.intersects_with_rectangle", generar_rectangulos, _cruce_rectangulos),
+    Caso("rectangle.interference_line", lambda n: (generar_rectangulos(n), generar_lineas(n, semilla=1)), _interferencia_linea),
+    Caso("grid_index.query_rectangle", _construir_indice, _consulta_indice),
+    Caso("sweep_and_prune.overlapping_pairs", generar_rectangulos, _sweep_and_prune, por_lote=True),
+    Caso("triangle.metrics", generar_triangulos, _metricas_triangulo),
+    Caso("triangle_batch.metrics", lambda n: TriangleBatch.from_triangles(generar_triangulos(n)), _metricas_lote, por_lote=True),
+]
+
+def percentil(valores_ordenados, p):
+    if not valores_ordenados:
+        return 0.0
+    k = min(len(valores_ordenados) - 1, max(0, round(p / 100 * (len(valores_ordenados) - 1))))
+    return valores_ordenados[k]
+
+def medir(caso, n, repeticiones, max_llamadas):
+    estado = caso.construir(n)
+    if caso.por_lote:
+        llamadas = repeticiones
+        items_por_llamada = n
+    else:
+        llamadas = min(n, max_llamadas)
+        items_por_llamada = 1
+    caso.llamar(estado, 0)
+    latencias = []
+    reloj = time.perf_counter_ns
+    for i in range(llamadas):
+        inicio = reloj()
+        caso.llamar(estado, i)
+        latencias.append(reloj() - inicio)
+    total = sum(latencias) / 1e9
+    latencias.sort()
+    # la memoria pico incluye construir la escena, se mide aparte porque tracemalloc frena las llamadas
+    del estado
+    tracemalloc.start()
+    estado = caso.construir(n)
+    for i in range(min(llamadas, 100)):
+        caso.llamar(estado, i)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "caso": caso.nombre,
+        "n": n,
+        "llamadas": llamadas,
+        "ops_por_seg": llamadas * items_por_llamada / total if total > 0 else float("inf"),
+        "p50_us": percentil(latencias, 50) / 1e3,
+        "p90_us": percentil(latencias, 90) / 1e3,
+        "p99_us": percentil(latencias, 99) / 1e3,
+        "memoria_pico_kb": pico / 1024,
+    }
+
+def clave(resultado):
+    return f"{resultado['caso']}@{resultado['n']}"
+
+def comparar(resultados, baseline, umbral):
+    regresiones = []
+    for resultado in resultados:
+        anterior = baseline.get(clave(resultado))
+        if anterior is None:
+            continue
+        if resultado["ops_por_seg"] < anterior["ops_por_seg"] * (1 - umbral):
+            regresiones.append((clave(resultado), anterior["ops_por_seg"], resultado["ops_por_seg"]))
+    return regresiones
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description="Benchmarks de paquete_shape")
+    parser.add_argument("--escalas", type=int, nargs="+", default=[1000, 10000], help="numero de figuras por escena (1e3 a 1e6)")
+    parser.add_argument("--casos", nargs="+", help="subconjunto de casos a ejecutar")
+    parser.add_argument("--repeticiones", type=int, default=5, help="llamadas por caso de lote")
+    parser.add_argument("--max-llamadas", type=int, default=20000, help="tope de llamadas medidas en casos escalares")
+    parser.add_argument("--baseline", help="JSON con el que comparar")
+    parser.add_argument("--guardar-baseline", help="guarda los resultados como baseline JSON")
+    parser.add_argument("--umbral", type=float, default=0.2, help="perdida relativa de ops/seg tolerada")
+    args = parser.parse_args(argv)
+
+    casos = [caso for caso in CASOS if not args.casos or caso.nombre in args.casos]
+    resultados = []
+    print(f"{'caso':<36}{'n':>9}{'ops/seg':>14}{'p50 us':>10}{'p90 us':>10}{'p99 us':>10}{'pico KB':>11}")
+    # los metodos de interferencia originales imprimen su resultado: se descarta para no mezclarlo con la tabla
+    with open(os.devnull, "w") as descarte:
+        for n in args.escalas:
+            for caso in casos:
+                with contextlib.redirect_stdout(descarte):
+                    resultado = medir(caso, n, args.repeticiones, args.max_llamadas)
+                resultados.append(resultado)
+                print(f"{resultado['caso']:<36}{n:>9}{resultado['ops_por_seg']:>14.0f}{resultado['p50_us']:>10.2f}"
+                      f"{resultado['p90_us']:>10.2f}{resultado['p99_us']:>10.2f}{resultado['memoria_pico_kb']:>11.0f}")
+
+    if args.guardar_baseline:
+        with open(args.guardar_baseline, "w") as archivo:
+            json.dump({clave(resultado): resultado for resultado in resultados}, archivo, indent=2)
+        print(f"Baseline guardado en {args.guardar_baseline}")
+
+    if args.baseline:
+        with open(args.baseline) as archivo:
+            baseline = json.load(archivo)
+        regresiones = comparar(resultados, baseline, args.umbral)
+        for nombre, antes, ahora in regresiones:
+            print(f"REGRESION {nombre}: {antes:.0f} -> {ahora:.0f} ops/seg")
+        if regresiones:
+            return 1
+        print("Sin regresiones")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+"""
+Mide el tiempo de `import paquete_shape` en un interprete limpio.
+
+Uso:
+    python benchmarks/import_time.py --presupuesto-ms 15
+
+Termina con codigo 1 si el mejor de las repeticiones supera el presupuesto
+o si el import carga submodulos que deberian ser perezosos.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MEDICION = """
+import sys, time, json
+inicio = time.perf_counter()
+import paquete_shape
+fin = time.perf_counter()
+print(json.dumps({"segundos": fin - inicio, "modulos": sorted(m for m in sys.modules if m.startswith("paquete_shape"))}))
+"""
+
+MODULOS_EAGER = {"paquete_shape", "paquete_shape.point"}
+
+def medir(repeticiones):
+    mediciones = []
+    for _ in range(repeticiones):
+        salida = subprocess.run([sys.executable, "-c", MEDICION], cwd=RAIZ, capture_output=True, text=True, check=True)
+        mediciones.append(json.loads(salida.stdout))
+    return mediciones
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description="Tiempo de import de paquete_shape")
+    parser.add_argument("--repeticiones", type=int, default=10)
+    parser.add_argument("--presupuesto-ms", type=float, default=15.0)
+    args = parser.parse_args(argv)
+
+    mediciones = medir(args.repeticiones)
+    tiempos = sorted(medicion["segundos"] * 1e3 for medicion in mediciones)
+    mejor = tiempos[0]
+    mediana = tiempos[len(tiempos) // 2]
+    cargados = set(mediciones[0]["modulos"])
+    print(f"import paquete_shape: mejor {mejor:.2f} ms, mediana {mediana:.2f} ms (presupuesto {args.presupuesto_ms:.2f} ms)")
+    print(f"submodulos cargados: {', '.join(sorted(cargados))}")
+
+    codigo = 0
+    extra = cargados - MODULOS_EAGER
+    if extra:
+        print(f"ERROR: se cargaron submodulos que deberian ser perezosos: {', '.join(sorted(extra))}")
+        codigo = 1
+    if mejor > args.presupuesto_ms:
+        print("ERROR: el import supera el presupuesto")
+        codigo = 1
+    return codigo
+
+if __name__ == "__main__":
+    sys.exit(main())
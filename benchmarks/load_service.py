@@ -0,0 +1,119 @@
+"""
+Generador de carga para el servicio de paquete_shape (paquete_shape/service.py).
+
+Uso:
+    python benchmarks/load_service.py --clientes 64 --peticiones 200 --ventanas-ms 0 1
+    python benchmarks/load_service.py --host 127.0.0.1 --puerto 8765
+
+Sin --puerto levanta un servidor en un subproceso por cada ventana pedida. Con
+ventana 0 se juntan solo las peticiones leidas en la misma vuelta del event
+loop; --lote-max 1 desactiva los lotes y sirve de referencia.
+Cada cliente abre una conexion y manda una peticion tras otra; se informa el
+rendimiento total y la latencia p50/p99 vista por los clientes.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+OPERACIONES = ("distance", "rectangle_interference", "triangle_metrics")
+
+def generar_peticion(rng, operacion, identificador):
+    if operacion == "distance":
+        return {"id": identificador, "op": operacion,
+                "a": [rng.uniform(0, 1000), rng.uniform(0, 1000)], "b": [rng.uniform(0, 1000), rng.uniform(0, 1000)]}
+    if operacion == "rectangle_interference":
+        return {"id": identificador, "op": operacion,
+                "a": [rng.uniform(0, 1000), rng.uniform(0, 1000), rng.uniform(1, 100), rng.uniform(1, 100)],
+                "b": [rng.uniform(0, 1000), rng.uniform(0, 1000), rng.uniform(1, 100), rng.uniform(1, 100)]}
+    x, y = rng.uniform(0, 1000), rng.uniform(0, 1000)
+    return {"id": identificador, "op": operacion,
+            "points": [[x, y], [x + rng.uniform(1, 50), y], [x + rng.uniform(-25, 25), y + rng.uniform(1, 50)]]}
+
+def percentil(valores_ordenados, p):
+    if not valores_ordenados:
+        return 0.0
+    k = min(len(valores_ordenados) - 1, max(0, round(p / 100 * (len(valores_ordenados) - 1))))
+    return valores_ordenados[k]
+
+async def cliente(host, puerto, peticiones, operaciones, semilla, latencias, errores):
+    rng = random.Random(semilla)
+    reader, writer = await asyncio.open_connection(host, puerto)
+    try:
+        for i in range(peticiones):
+            peticion = generar_peticion(rng, rng.choice(operaciones), i)
+            inicio = time.perf_counter()
+            writer.write(json.dumps(peticion).encode() + b"\n")
+            await writer.drain()
+            respuesta = json.loads(await reader.readline())
+            latencias.append(time.perf_counter() - inicio)
+            if "error" in respuesta or respuesta.get("id") != i:
+                errores.append(respuesta)
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+async def generar_carga(host, puerto, clientes, peticiones, operaciones):
+    latencias = []
+    errores = []
+    inicio = time.perf_counter()
+    await asyncio.gather(*(cliente(host, puerto, peticiones, operaciones, semilla, latencias, errores)
+                           for semilla in range(clientes)))
+    duracion = time.perf_counter() - inicio
+    latencias.sort()
+    return {
+        "peticiones": len(latencias),
+        "errores": len(errores),
+        "segundos": duracion,
+        "peticiones_seg": len(latencias) / duracion if duracion > 0 else 0.0,
+        "p50_ms": percentil(latencias, 50) * 1e3,
+        "p99_ms": percentil(latencias, 99) * 1e3,
+    }
+
+def levantar_servidor(ventana_ms, lote_max):
+    proceso = subprocess.Popen([sys.executable, "-m", "paquete_shape.service", "--puerto", "0",
+                                "--ventana-ms", str(ventana_ms), "--lote-max", str(lote_max)],
+                               cwd=RAIZ, stdout=subprocess.PIPE, text=True)
+    linea = proceso.stdout.readline()
+    if not linea.startswith("Escuchando en "):
+        proceso.kill()
+        raise RuntimeError(f"El servidor no arranco: {linea!r}")
+    host, puerto = linea.split()[-1].rsplit(":", 1)
+    return proceso, host, int(puerto)
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description="Carga concurrente contra el servicio de paquete_shape")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, help="usar un servidor ya levantado en vez de uno propio")
+    parser.add_argument("--clientes", type=int, default=64)
+    parser.add_argument("--peticiones", type=int, default=200, help="peticiones por cliente")
+    parser.add_argument("--operaciones", nargs="+", choices=OPERACIONES, default=list(OPERACIONES))
+    parser.add_argument("--ventanas-ms", nargs="+", type=float, default=[0.0, 1.0])
+    parser.add_argument("--lote-max", type=int, default=1024)
+    args = parser.parse_args(argv)
+
+    print(f"{'ventana ms':>11}{'peticiones':>12}{'errores':>9}{'pet/seg':>12}{'p50 ms':>10}{'p99 ms':>10}")
+    configuraciones = [(None, args.host, args.puerto)] if args.puerto else [(ventana, None, None) for ventana in args.ventanas_ms]
+    for ventana, host, puerto in configuraciones:
+        proceso = None
+        if puerto is None:
+            proceso, host, puerto = levantar_servidor(ventana, args.lote_max)
+        try:
+            resultado = asyncio.run(generar_carga(host, puerto, args.clientes, args.peticiones, args.operaciones))
+        finally:
+            if proceso is not None:
+                proceso.terminate()
+                proceso.wait()
+        etiqueta = "-" if ventana is None else f"{ventana:g}"
+        print(f"{etiqueta:>11}{resultado['peticiones']:>12}{resultado['errores']:>9}{resultado['peticiones_seg']:>12.0f}"
+              f"{resultado['p50_ms']:>10.2f}{resultado['p99_ms']:>10.2f}")
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,51 @@
-from .point import Point
-from .line import Line
-from .shape import Shape
-from .rectangle import Rectangle
-from .triangle import Triangle
+from importlib import import_module
+from .point import Point, PointPool
+
+# el resto de submodulos se importa la primera vez que se pide el nombre
+_LAZY = {
+    'PointArray': '.point_array',
+    'Line': '.line',
+    'Shape': '.shape',
+    'ShapeError': '.shape',
+    'Rectangle': '.rectangle',
+    'Triangle': '.triangle',
+    'GridIndex': '.spatial_index',
+    'SpatialIndexError': '.spatial_index',
+    'locate_points': '.spatial_index',
+    'SweepAndPrune': '.sweep_and_prune',
+    'TriangleBatch': '.triangle_batch',
+    'write_shapes': '.binary_format',
+    'ShapeFile': '.binary_format',
+    'ShapeFormatError': '.binary_format',
+    'process_file': '.pipeline',
+    'InvalidRecordError': '.pipeline',
+    'BatchExecutor': '.executor',
+    'KDTree': '.kdtree',
+    'Polygon': '.polygon',
+    'InvalidPolygonError': '.polygon',
+    'SweepLine': '.sweep_line',
+    'SweepLineError': '.sweep_line',
+    'find_intersections': '.sweep_line',
+    'perfilar': '.instrumentation',
+    'GeometryServer': '.service',
+}
 
 __all__ = [
-    'Point', 'Line', 'Shape', 'Rectangle', 'Triangle'
+    'Point', 'PointPool', 'PointArray', 'Line', 'Shape', 'ShapeError', 'Rectangle', 'Triangle',
+    'GridIndex', 'SpatialIndexError', 'locate_points', 'SweepAndPrune',
+    'TriangleBatch', 'write_shapes', 'ShapeFile', 'ShapeFormatError',
+    'process_file', 'InvalidRecordError', 'BatchExecutor',
+    'KDTree', 'Polygon', 'InvalidPolygonError', 'SweepLine', 'SweepLineError', 'find_intersections',
+    'perfilar', 'GeometryServer'
 ]
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,168 @@
+import mmap
+import struct
+import sys
+from array import array
+from itertools import chain
+from .shape import ShapeError
+from .point import Point
+from .line import Line
+from .rectangle import Rectangle
+from .triangle import Triangle
+
+class ShapeFormatError(ShapeError):
+    pass
+
+MAGIC = b'PSHP'
+VERSION = 1
+# magic, version, tipo de registro, numero de registros; 16 bytes para que los float64 queden alineados
+HEADER = struct.Struct('<4sHHQ')
+CHUNK = 4096
+
+# tipo -> (codigo, campos float64 por registro)
+KINDS = {
+    'point': (1, ('x', 'y')),
+    'line': (2, ('x0', 'y0', 'x1', 'y1')),
+    'rectangle': (3, ('x', 'y', 'width', 'height')),
+    'triangle': (4, ('ax', 'ay', 'bx', 'by', 'cx', 'cy')),
+}
+CODES = {code: (kind, fields) for kind, (code, fields) in KINDS.items()}
+
+def _kind_of(shape):
+    if isinstance(shape, Point):
+        return 'point'
+    if isinstance(shape, Line):
+        return 'line'
+    if isinstance(shape, Rectangle):
+        return 'rectangle'
+    if isinstance(shape, Triangle):
+        return 'triangle'
+    raise ShapeFormatError(f"Tipo no soportado: {type(shape).__name__}")
+
+def _record(kind, shape):
+    if kind == 'point':
+        return (shape.x, shape.y)
+    if kind == 'line':
+        return (shape.inicio.x, shape.inicio.y, shape.final.x, shape.final.y)
+    if kind == 'rectangle':
+        xmin, ymin, xmax, ymax = shape.compute_bounds()
+        return (xmin, ymin, shape.width, shape.height)
+    if len(shape.edges) != 3:
+        raise ShapeFormatError("Un triangulo debe tener 3 lados")
+    a, b, c = (edge.inicio for edge in shape.edges)
+    return (a.x, a.y, b.x, b.y, c.x, c.y)
+
+def _build(kind, values):
+    if kind == 'point':
+        return Point(*values)
+    if kind == 'line':
+        return Line(Point(values[0], values[1]), Point(values[2], values[3]))
+    if kind == 'rectangle':
+        return Rectangle.from_dimensions(*values)
+    return Triangle.from_points(Point(values[0], values[1]), Point(values[2], values[3]), Point(values[4], values[5]))
+
+def write_shapes(path, shapes, kind = None):
+    # todas las figuras de un archivo son del mismo tipo; se escriben por bloques
+    shapes = iter(shapes)
+    first = None
+    if kind is None:
+        first = next(shapes, None)
+        if first is None:
+            raise ShapeFormatError("Sin figuras no se puede deducir el tipo, indica kind")
+        kind = _kind_of(first)
+    if kind not in KINDS:
+        raise ShapeFormatError(f"Tipo desconocido: {kind}")
+    code, fields = KINDS[kind]
+    count = 0
+    with open(path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, VERSION, code, 0))
+        buffer = array('d')
+        if first is not None:
+            shapes = chain((first,), shapes)
+        for shape in shapes:
+            if _kind_of(shape) != kind:
+                raise ShapeFormatError(f"Se esperaba {kind}, se recibio {_kind_of(shape)}")
+            buffer.extend(_record(kind, shape))
+            count += 1
+            if len(buffer) >= CHUNK * len(fields):
+                _flush(file, buffer)
+                buffer = array('d')
+        _flush(file, buffer)
+        file.seek(0)
+        file.write(HEADER.pack(MAGIC, VERSION, code, count))
+    return count
+
+def _flush(file, buffer):
+    if sys.byteorder != 'little':
+        buffer.byteswap()
+    buffer.tofile(file)
+
+class ShapeFile:
+    def __init__(self, path):
+        if sys.byteorder != 'little':
+            raise ShapeFormatError("La lectura sin copia requiere una maquina little-endian")
+        self._file = open(path, 'rb')
+        try:
+            header = self._file.read(HEADER.size)
+            if len(header) < HEADER.size:
+                raise ShapeFormatError("Archivo truncado")
+            magic, version, code, count = HEADER.unpack(header)
+            if magic != MAGIC:
+                raise ShapeFormatError("No es un archivo de figuras")
+            if version != VERSION:
+                raise ShapeFormatError(f"Version no soportada: {version}")
+            if code not in CODES:
+                raise ShapeFormatError(f"Tipo de registro desconocido: {code}")
+            self.kind, self.fields = CODES[code]
+            self.count = count
+            size = HEADER.size + 8 * len(self.fields) * count
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            if len(self._mmap) < size:
+                self._mmap.close()
+                raise ShapeFormatError("Archivo truncado")
+        except Exception:
+            self._file.close()
+            raise
+        self._view = memoryview(self._mmap)
+        self.values = self._view[HEADER.size:size].cast('d')
+        self._columns = {}
+    def column(self, name):
+        # vista con paso sobre el mmap, sin copiar
+        if name not in self._columns:
+            if name not in self.fields:
+                raise ShapeFormatError(f"Campo desconocido para {self.kind}: {name}")
+            self._columns[name] = self.values[self.fields.index(name)::len(self.fields)]
+        return self._columns[name]
+    def __getattr__(self, name):
+        if name in self.__dict__.get('fields', ()):
+            return self.column(name)
+        raise AttributeError(name)
+    def __len__(self):
+        return self.count
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("Indice fuera de rango")
+        width = len(self.fields)
+        return _build(self.kind, self.values[index * width:(index + 1) * width].tolist())
+    def __iter__(self):
+        for index in range(self.count):
+            yield self[index]
+    def close(self):
+        # las vistas sacadas de values o de column() tienen que liberarse antes de cerrar: si alguna
+        # sigue en uso se lanza BufferError y el mmap queda abierto, pero el archivo se cierra igual
+        try:
+            for view in self._columns.values():
+                view.release()
+            self._columns = {}
+            self.values.release()
+            self._view.release()
+            self._mmap.close()
+        finally:
+            self._file.close()
+    def __enter__(self):
+        return self
+    def __exit__(self, *exc):
+        self.close()
+    def __str__(self):
+        return f"ShapeFile(kind={self.kind}, count={self.count})"
@@ -0,0 +1,174 @@
+import os
+from array import array
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from math import hypot
+from multiprocessing import shared_memory
+from .shape import ShapeError
+from .rectangle import Rectangle, InvalidRectangleError
+from .sweep_and_prune import SweepAndPrune
+from .triangle_batch import TriangleBatch
+
+class ExecutorError(ShapeError):
+    pass
+
+# lo que devuelven triangle_metrics y rectangle_metrics, siempre en este orden
+Metrics = namedtuple('Metrics', ['areas', 'perimeters'])
+
+# nucleos de calculo: trabajan sobre columnas (array o memoryview) en el rango [lo, hi)
+# y los usan igual el camino serial y los procesos del pool
+
+def _triangle_kernel(columns, lo, hi, areas, perimeters):
+    ax, ay, bx, by, cx, cy = columns
+    for i in range(lo, hi):
+        x0, y0, x1, y1, x2, y2 = ax[i], ay[i], bx[i], by[i], cx[i], cy[i]
+        perimeters[i] = hypot(x1 - x0, y1 - y0) + hypot(x2 - x1, y2 - y1) + hypot(x0 - x2, y0 - y2)
+        areas[i] = abs((x1 - x0) * (y2 - y0) - (y1 - y0) * (x2 - x0)) / 2
+
+def _rectangle_kernel(columns, lo, hi, areas, perimeters):
+    xmin, ymin, xmax, ymax = columns
+    for i in range(lo, hi):
+        width = xmax[i] - xmin[i]
+        height = ymax[i] - ymin[i]
+        areas[i] = width * height
+        perimeters[i] = 2 * width + 2 * height
+
+def _pairs_kernel(columns, order, lo, hi):
+    # barrido hacia adelante sobre el orden por xmin: cada par sale una sola vez, desde su extremo izquierdo
+    xmin, ymin, xmax, ymax = columns
+    n = len(order)
+    pairs = []
+    for p in range(lo, hi):
+        i = order[p]
+        right = xmax[i]
+        bottom = ymin[i]
+        top = ymax[i]
+        for q in range(p + 1, n):
+            j = order[q]
+            if xmin[j] > right:
+                break
+            if ymin[j] <= top and bottom <= ymax[j]:
+                pairs.append((i, j) if i < j else (j, i))
+    return pairs
+
+def _attach(name, columns, n):
+    shm = shared_memory.SharedMemory(name=name)
+    view = shm.buf.cast('d')
+    return shm, view, [view[c * n:(c + 1) * n] for c in range(columns)]
+
+def _release(shm, view, parts):
+    for part in parts:
+        part.release()
+    view.release()
+    shm.close()
+
+def _metrics_task(kernel, name, inputs, n, lo, hi):
+    shm, view, parts = _attach(name, inputs + 2, n)
+    try:
+        kernel(parts[:inputs], lo, hi, parts[inputs], parts[inputs + 1])
+    finally:
+        _release(shm, view, parts)
+
+def _pairs_task(name, n, lo, hi):
+    # columnas xmin, ymin, xmax, ymax y el orden por xmin guardado como float64
+    shm, view, parts = _attach(name, 5, n)
+    try:
+        order = [int(value) for value in parts[4]]
+        return _pairs_kernel(parts[:4], order, lo, hi)
+    finally:
+        _release(shm, view, parts)
+
+class BatchExecutor:
+    def __init__(self, workers = None, chunk_size = 50000, serial_threshold = 20000):
+        if chunk_size <= 0:
+            raise ExecutorError("El tamano de bloque debe ser positivo")
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.serial_threshold = serial_threshold
+        self._pool = None
+    def _serial(self, n):
+        return n < self.serial_threshold or self.workers == 1
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+    def _ranges(self, n):
+        return [(lo, min(lo + self.chunk_size, n)) for lo in range(0, n, self.chunk_size)]
+    def _share(self, columns, extra = 0):
+        n = len(columns[0])
+        shm = shared_memory.SharedMemory(create=True, size=max(8 * n * (len(columns) + extra), 8))
+        view = shm.buf.cast('d')
+        for c, column in enumerate(columns):
+            view[c * n:(c + 1) * n] = array('d', column)
+        return shm, view
+    def _run_metrics(self, kernel, columns):
+        n = len(columns[0])
+        if self._serial(n):
+            areas = array('d', bytes(8 * n))
+            perimeters = array('d', bytes(8 * n))
+            kernel(columns, 0, n, areas, perimeters)
+            return Metrics(areas, perimeters)
+        shm, view = self._share(columns, extra=2)
+        try:
+            futures = [self._get_pool().submit(_metrics_task, kernel, shm.name, len(columns), n, lo, hi)
+                       for lo, hi in self._ranges(n)]
+            for future in futures:
+                future.result()
+            inputs = len(columns)
+            areas = array('d', view[inputs * n:(inputs + 1) * n])
+            perimeters = array('d', view[(inputs + 1) * n:(inputs + 2) * n])
+            return Metrics(areas, perimeters)
+        finally:
+            view.release()
+            shm.close()
+            shm.unlink()
+    def triangle_metrics(self, batch: "TriangleBatch"):
+        if not isinstance(batch, TriangleBatch):
+            raise ExecutorError("Se esperaba TriangleBatch")
+        return self._run_metrics(_triangle_kernel, [batch.ax, batch.ay, batch.bx, batch.by, batch.cx, batch.cy])
+    def rectangle_metrics(self, rectangles):
+        return self._run_metrics(_rectangle_kernel, _bounds_columns(rectangles))
+    def overlapping_pairs(self, rectangles):
+        return self.overlapping_pairs_from_bounds(*_bounds_columns(rectangles))
+    def overlapping_pairs_from_bounds(self, xmin, ymin, xmax, ymax):
+        n = len(xmin)
+        if not n == len(ymin) == len(xmax) == len(ymax):
+            raise InvalidRectangleError("Los limites deben tener la misma longitud")
+        if self._serial(n):
+            return SweepAndPrune().overlapping_pairs_from_bounds(xmin, ymin, xmax, ymax)
+        order = sorted(range(n), key=xmin.__getitem__)
+        shm, view = self._share([xmin, ymin, xmax, ymax, order])
+        try:
+            futures = [self._get_pool().submit(_pairs_task, shm.name, n, lo, hi) for lo, hi in self._ranges(n)]
+            pairs = []
+            for future in futures:
+                pairs.extend(future.result())
+        finally:
+            view.release()
+            shm.close()
+            shm.unlink()
+        pairs.sort()
+        return pairs
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+    def __enter__(self):
+        return self
+    def __exit__(self, *exc):
+        self.close()
+
+def _bounds_columns(rectangles):
+    xmin = array('d')
+    ymin = array('d')
+    xmax = array('d')
+    ymax = array('d')
+    for rectangle in rectangles:
+        if not isinstance(rectangle, Rectangle):
+            raise InvalidRectangleError("Se esperaba Rectangle")
+        left, bottom, right, top = rectangle.compute_bounds()
+        xmin.append(left)
+        ymin.append(bottom)
+        xmax.append(right)
+        ymax.append(top)
+    return [xmin, ymin, xmax, ymax]
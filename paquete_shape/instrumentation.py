@@ -0,0 +1,127 @@
+import json
+import sys
+from contextlib import contextmanager
+from functools import wraps
+from threading import Lock
+from time import perf_counter_ns
+from .line import Line
+from .rectangle import Rectangle
+from .triangle import Triangle
+
+# metodos medidos: todos los compute_* de cada clase y los que devuelven listas grandes
+EXTRA_METHODS = {
+    Line: ('range_of_the_line',),
+}
+
+# una lista devuelta con al menos estos elementos cuenta como grande
+LARGE_LIST = 1000
+
+_lock = Lock()
+_originals = {}
+# nombre -> [llamadas, nanosegundos, bloques netos, elementos devueltos en listas, listas grandes]
+_stats = {}
+
+def _targets():
+    for cls in (Line, Rectangle, Triangle):
+        names = [name for name in vars(cls) if name.startswith('compute_')]
+        names.extend(EXTRA_METHODS.get(cls, ()))
+        for name in names:
+            yield cls, name
+
+def _wrap(qualified, method):
+    record = _stats.setdefault(qualified, [0, 0, 0, 0, 0])
+    @wraps(method)
+    def measured(*args, **kwargs):
+        blocks = sys.getallocatedblocks()
+        start = perf_counter_ns()
+        try:
+            result = method(*args, **kwargs)
+        finally:
+            elapsed = perf_counter_ns() - start
+            # bloques netos, no asignaciones: lo que la llamada deja vivo (incluida la cache) menos lo que
+            # libera; los temporales que se liberan antes de volver no cuentan y el valor puede ser negativo
+            net_blocks = sys.getallocatedblocks() - blocks
+            record[0] += 1
+            record[1] += elapsed
+            record[2] += net_blocks
+        if isinstance(result, list):
+            record[3] += len(result)
+            if len(result) >= LARGE_LIST:
+                record[4] += 1
+        return result
+    return measured
+
+def enable():
+    # sustituye los metodos en las clases; sin activar no hay ningun envoltorio en el camino
+    with _lock:
+        if _originals:
+            return
+        for cls, name in _targets():
+            method = vars(cls)[name]
+            _originals[(cls, name)] = method
+            setattr(cls, name, _wrap(f"{cls.__name__}.{name}", method))
+
+def disable():
+    with _lock:
+        for (cls, name), method in _originals.items():
+            setattr(cls, name, method)
+        _originals.clear()
+
+def is_enabled():
+    return bool(_originals)
+
+def reset():
+    with _lock:
+        for record in _stats.values():
+            record[:] = [0, 0, 0, 0, 0]
+
+def _raw():
+    return {name: list(record) for name, record in _stats.items()}
+
+def _format(raw):
+    snapshot = {}
+    for name, (calls, nanoseconds, net_blocks, items, large) in sorted(raw.items()):
+        if not calls:
+            continue
+        snapshot[name] = {
+            'calls': calls,
+            'total_seconds': nanoseconds / 1e9,
+            'mean_seconds': nanoseconds / 1e9 / calls,
+            'net_blocks': net_blocks,
+            'list_items': items,
+            'large_lists': large,
+        }
+    return snapshot
+
+def snapshot():
+    return _format(_raw())
+
+def to_json(data = None, indent = None):
+    return json.dumps(snapshot() if data is None else data, indent=indent)
+
+class Perfil:
+    def __init__(self):
+        self.stats = {}
+    def to_json(self, indent = None):
+        return to_json(self.stats, indent)
+    def __str__(self):
+        return f"Perfil(metodos={len(self.stats)})"
+
+@contextmanager
+def perfilar():
+    # mide solo lo que pasa dentro del bloque; si ya estaba activado lo deja activado al salir
+    was_enabled = is_enabled()
+    enable()
+    before = _raw()
+    perfil = Perfil()
+    try:
+        yield perfil
+    finally:
+        after = _raw()
+        difference = {}
+        for name, record in after.items():
+            previous = before.get(name, [0, 0, 0, 0, 0])
+            difference[name] = [now - then for now, then in zip(record, previous)]
+        perfil.stats = _format(difference)
+        if not was_enabled:
+            disable()
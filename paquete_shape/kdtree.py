@@ -0,0 +1,143 @@
+from array import array
+from heapq import heappush, heappushpop
+from .shape import ShapeError
+from .point import Point, InvalidPointError
+from .point_array import PointArray
+
+class KDTreeError(ShapeError):
+    pass
+
+LEAF_SIZE = 8
+
+class KDTree:
+    def __init__(self, points):
+        if isinstance(points, PointArray):
+            self.xs = array('d', points.xs)
+            self.ys = array('d', points.ys)
+        else:
+            points = PointArray.from_points(points)
+            self.xs = points.xs
+            self.ys = points.ys
+        n = len(self.xs)
+        # arbol implicito: el nodo [lo, hi) guarda su mediana en index[(lo + hi) // 2]
+        self.index = array('q', range(n))
+        if n:
+            by_x = sorted(range(n), key=lambda i: (self.xs[i], i))
+            by_y = sorted(range(n), key=lambda i: (self.ys[i], i))
+            self._build(0, n, 0, by_x, by_y, bytearray(n))
+    def _build(self, lo, hi, depth, by_x, by_y, marks):
+        # by_x y by_y son los mismos puntos ordenados por cada eje; se parten en O(n) por nivel
+        if hi - lo <= LEAF_SIZE:
+            self.index[lo:hi] = array('q', by_x)
+            return
+        primary, other = (by_x, by_y) if depth % 2 == 0 else (by_y, by_x)
+        middle = (hi - lo) // 2
+        left = primary[:middle]
+        right = primary[middle + 1:]
+        median = primary[middle]
+        for i in left:
+            marks[i] = 1
+        other_left = []
+        other_right = []
+        for i in other:
+            if marks[i]:
+                other_left.append(i)
+            elif i != median:
+                other_right.append(i)
+        for i in left:
+            marks[i] = 0
+        self.index[lo + middle] = median
+        if depth % 2 == 0:
+            self._build(lo, lo + middle, depth + 1, left, other_left, marks)
+            self._build(lo + middle + 1, hi, depth + 1, right, other_right, marks)
+        else:
+            self._build(lo, lo + middle, depth + 1, other_left, left, marks)
+            self._build(lo + middle + 1, hi, depth + 1, other_right, right, marks)
+    def __len__(self):
+        return len(self.xs)
+    @staticmethod
+    def _coordinates(point):
+        if not isinstance(point, Point):
+            raise InvalidPointError("Se esperaba Point")
+        return point.x, point.y
+    def query(self, point: "Point", k = 1):
+        # k vecinos mas cercanos como [(distancia, indice)], empates resueltos por indice como en la fuerza bruta
+        if k <= 0:
+            raise KDTreeError("k debe ser positivo")
+        return self._knn(*self._coordinates(point), k)
+    def _knn(self, px, py, k):
+        xs = self.xs
+        ys = self.ys
+        index = self.index
+        heap = []
+        stack = [(0, len(xs), 0)]
+        while stack:
+            lo, hi, depth = stack.pop()
+            if hi - lo <= LEAF_SIZE:
+                for p in range(lo, hi):
+                    i = index[p]
+                    d2 = (xs[i] - px) ** 2 + (ys[i] - py) ** 2
+                    if len(heap) < k:
+                        heappush(heap, (-d2, -i))
+                    elif (d2, i) < (-heap[0][0], -heap[0][1]):
+                        heappushpop(heap, (-d2, -i))
+                continue
+            middle = (lo + hi) // 2
+            i = index[middle]
+            d2 = (xs[i] - px) ** 2 + (ys[i] - py) ** 2
+            if len(heap) < k:
+                heappush(heap, (-d2, -i))
+            elif (d2, i) < (-heap[0][0], -heap[0][1]):
+                heappushpop(heap, (-d2, -i))
+            diff = (px - xs[i]) if depth % 2 == 0 else (py - ys[i])
+            near, far = ((lo, middle), (middle + 1, hi)) if diff < 0 else ((middle + 1, hi), (lo, middle))
+            # se apila primero el lado lejano para visitar antes el cercano
+            if len(heap) < k or diff * diff <= -heap[0][0]:
+                stack.append((far[0], far[1], depth + 1))
+            stack.append((near[0], near[1], depth + 1))
+        result = sorted((-d2, -i) for d2, i in heap)
+        return [(d2 ** 0.5, i) for d2, i in result]
+    def query_radius(self, point: "Point", radius):
+        # indices a distancia <= radius, en orden ascendente
+        if radius < 0:
+            raise KDTreeError("El radio no puede ser negativo")
+        return self._radius(*self._coordinates(point), radius)
+    def _radius(self, px, py, radius):
+        xs = self.xs
+        ys = self.ys
+        index = self.index
+        found = []
+        stack = [(0, len(xs), 0)]
+        while stack:
+            lo, hi, depth = stack.pop()
+            if hi - lo <= LEAF_SIZE:
+                for p in range(lo, hi):
+                    i = index[p]
+                    if ((xs[i] - px) ** 2 + (ys[i] - py) ** 2) ** 0.5 <= radius:
+                        found.append(i)
+                continue
+            middle = (lo + hi) // 2
+            i = index[middle]
+            if ((xs[i] - px) ** 2 + (ys[i] - py) ** 2) ** 0.5 <= radius:
+                found.append(i)
+            diff = (px - xs[i]) if depth % 2 == 0 else (py - ys[i])
+            if diff <= radius:
+                stack.append((lo, middle, depth + 1))
+            if -diff <= radius:
+                stack.append((middle + 1, hi, depth + 1))
+        found.sort()
+        return found
+    def query_many(self, points, k = 1):
+        if k <= 0:
+            raise KDTreeError("k debe ser positivo")
+        if isinstance(points, PointArray):
+            return [self._knn(x, y, k) for x, y in zip(points.xs, points.ys)]
+        return [self._knn(*self._coordinates(point), k) for point in points]
+    def query_radius_many(self, points, radius):
+        if radius < 0:
+            raise KDTreeError("El radio no puede ser negativo")
+        if isinstance(points, PointArray):
+            return [self._radius(x, y, radius) for x, y in zip(points.xs, points.ys)]
+        return [self._radius(*self._coordinates(point), radius) for point in points]
+    def __str__(self):
+        return f"KDTree(n={len(self)})"
@@ -1,7 +1,7 @@
 import math
-
-class InvalidPointError(Exception):
-    pass
+from itertools import count
+from weakref import ref
+from .point import Point, InvalidPointError
 
 class InvalidLineError(Exception):
     pass
@@ -9,23 +9,20 @@ class InvalidLineError(Exception):
 class GeometricCalculationError(Exception):
     pass
 
-class Point:
-    def __init__(self, x, y):
-        try:
-            self.x = float(x)
-            self.y = float(y)
-        except Exception:
-            raise InvalidPointError("Coordenadas invalidas")
-    def distance_to(self, other):
-        if not isinstance(other, Point):
-            raise InvalidPointError("Se esperaba Point")
-        dx = self.x - other.x
-        dy = self.y - other.y
-        return math.sqrt(dx*dx + dy*dy)
-    def __str__(self):
-        return f"Point({self.x}, {self.y})"
-    def __eq__(self, other):
-        return isinstance(other, Point) and abs(self.x - other.x) < 1e-10 and abs(self.y - other.y) < 1e-10
+_versions = count()
+
+RASTER_MODES = ("dda", "bresenham", "step")
+
+def _snap(value):
+    # pixel mas cercano con los medios siempre hacia arriba: round() redondea al par y deja lineas desparejas
+    return math.floor(value + 0.5)
+
+def _check_raster(mode, step):
+    if mode not in RASTER_MODES:
+        raise GeometricCalculationError(f"Modo de rasterizado desconocido: {mode}")
+    # not step > 0 tambien rechaza NaN
+    if mode == "step" and not step > 0:
+        raise GeometricCalculationError("El paso debe ser positivo")
 
 class Line:
     def __init__(self, inicio: "Point" = Point(0, 0), final: "Point" = Point(0, 0)):
@@ -33,44 +30,168 @@ class Line:
             raise InvalidLineError("Los extremos deben ser Point")
         if inicio == final:
             raise InvalidLineError("Los puntos de inicio y final no pueden ser iguales")
-        self.inicio = inicio
-        self.final = final
-        self.length = None
-        self.slope = None
+        self._inicio = inicio
+        self._final = final
+        # referencias debiles a las figuras que tienen esta linea como lado, se crea con la primera
+        self._owners = None
+        self._touch()
+    def _watch(self, shape):
+        # sin callback ref() devuelve la misma referencia para la misma figura, asi los lados la comparten
+        owner = ref(shape)
+        if self._owners is None:
+            self._owners = [owner]
+        elif owner not in self._owners:
+            self._owners = [other for other in self._owners if other() is not None]
+            self._owners.append(owner)
+    def _touch(self):
+        # version unica global; ademas se vacia la cache de las figuras que usan esta linea
+        self.version = next(_versions)
+        self._length = None
+        self._slope = None
         self.range = None
+        if self._owners:
+            for owner in self._owners:
+                shape = owner()
+                if shape is not None:
+                    shape.invalidate()
+    @property
+    def inicio(self):
+        return self._inicio
+    @inicio.setter
+    def inicio(self, value):
+        if not isinstance(value, Point):
+            raise InvalidLineError("Los extremos deben ser Point")
+        if value == self._final:
+            raise InvalidLineError("Los puntos de inicio y final no pueden ser iguales")
+        self._inicio = value
+        self._touch()
+    @property
+    def final(self):
+        return self._final
+    @final.setter
+    def final(self, value):
+        if not isinstance(value, Point):
+            raise InvalidLineError("Los extremos deben ser Point")
+        if value == self._inicio:
+            raise InvalidLineError("Los puntos de inicio y final no pueden ser iguales")
+        self._final = value
+        self._touch()
+    @property
+    def length(self):
+        return self.compute_length()
+    @property
+    def slope(self):
+        return self.compute_slope()
     def compute_length(self):
-        self.length = self.inicio.distance_to(self.final)
-        if self.length <= 0:
-            raise GeometricCalculationError("Longitud no valida")
-        return self.length
+        if self._length is None:
+            length = self._inicio.distance_to(self._final)
+            if length <= 0:
+                raise GeometricCalculationError("Longitud no valida")
+            self._length = length
+        return self._length
     def compute_slope(self):
-        dx = self.final.x - self.inicio.x
-        if abs(dx) < 1e-10:
-            raise GeometricCalculationError("Pendiente indefinida (linea vertical)")
-        self.slope = (self.final.y - self.inicio.y) / dx
-        return self.slope
+        if self._slope is None:
+            dx = self._final.x - self._inicio.x
+            if abs(dx) < 1e-10:
+                raise GeometricCalculationError("Pendiente indefinida (linea vertical)")
+            self._slope = (self._final.y - self._inicio.y) / dx
+        return self._slope
     def range_of_the_line(self):
-        if self.slope is None:
-            raise GeometricCalculationError("Debes calcular la pendiente primero")
+        slope = self.compute_slope()
         self.range = []
         x0 = int(round(self.inicio.x))
         x1 = int(round(self.final.x))
         for i in range(x0, x1):
-            self.range.append(Point(i, self.slope * i))
+            self.range.append(Point(i, slope * i))
         return self.range
-    def horizontal_cross(self):
-        if self.range is None or len(self.range) < 2:
-            raise GeometricCalculationError("Debes calcular el rango primero")
-        for i in range(len(self.range) - 1):
-            if self.range[i].x < 0 and self.range[i + 1].x > 0:
-                print(f"Cross the x-axis between {self.range[i]} and {self.range[i+1]}")
+    def rasterize(self, mode = "dda", step = 1.0):
+        _check_raster(mode, step)
+        return (Point(x, y) for x, y in self._raster_coords(mode, step))
+    def raster_count(self, mode = "dda", step = 1.0):
+        _check_raster(mode, step)
+        x0, y0, x1, y1 = self.inicio.x, self.inicio.y, self.final.x, self.final.y
+        if mode == "step":
+            return math.ceil(math.hypot(x1 - x0, y1 - y0) / step) + 1
+        return max(abs(_snap(x1) - _snap(x0)), abs(_snap(y1) - _snap(y0))) + 1
+    def rasterize_into(self, buffer_x, buffer_y, mode = "dda", step = 1.0, offset = 0):
+        _check_raster(mode, step)
+        count = self.raster_count(mode, step)
+        if offset + count > len(buffer_x) or offset + count > len(buffer_y):
+            raise GeometricCalculationError(f"El buffer necesita al menos {offset + count} posiciones")
+        i = offset
+        for x, y in self._raster_coords(mode, step):
+            buffer_x[i] = x
+            buffer_y[i] = y
+            i += 1
+        return i - offset
+    def _raster_coords(self, mode, step):
+        if mode == "step":
+            x0, y0 = self.inicio.x, self.inicio.y
+            dx = self.final.x - x0
+            dy = self.final.y - y0
+            length = math.hypot(dx, dy)
+            n = math.ceil(length / step)
+            for i in range(n):
+                t = i * step / length
+                yield x0 + t * dx, y0 + t * dy
+            yield self.final.x, self.final.y
+            return
+        x0, y0 = _snap(self.inicio.x), _snap(self.inicio.y)
+        x1, y1 = _snap(self.final.x), _snap(self.final.y)
+        if mode == "dda":
+            n = max(abs(x1 - x0), abs(y1 - y0))
+            if n == 0:
+                yield x0, y0
                 return
+            sx = (x1 - x0) / n
+            sy = (y1 - y0) / n
+            for i in range(n + 1):
+                yield _snap(x0 + i * sx), _snap(y0 + i * sy)
+            return
+        dx = abs(x1 - x0)
+        dy = -abs(y1 - y0)
+        sx = 1 if x0 < x1 else -1
+        sy = 1 if y0 < y1 else -1
+        error = dx + dy
+        while True:
+            yield x0, y0
+            if x0 == x1 and y0 == y1:
+                return
+            e2 = 2 * error
+            if e2 >= dy:
+                error += dy
+                x0 += sx
+            if e2 <= dx:
+                error += dx
+                y0 += sy
+    def _points_to_scan(self, points):
+        if points is None:
+            if self.range is None or len(self.range) < 2:
+                raise GeometricCalculationError("Debes calcular el rango primero")
+            points = self.range
+        return iter(points)
+    def horizontal_cross(self, points = None):
+        # points puede ser cualquier iterable, p. ej. self.rasterize(); se corta en el primer cruce
+        points = self._points_to_scan(points)
+        previous = next(points, None)
+        if previous is None:
+            raise GeometricCalculationError("Debes calcular el rango primero")
+        for current in points:
+            if previous.x < 0 and current.x > 0:
+                print(f"Cross the x-axis between {previous} and {current}")
+                return True
+            previous = current
         print(f"don't Cross the x-axis")
-    def vertical_cross(self):
-        if self.range is None or len(self.range) < 2:
+        return False
+    def vertical_cross(self, points = None):
+        points = self._points_to_scan(points)
+        previous = next(points, None)
+        if previous is None:
             raise GeometricCalculationError("Debes calcular el rango primero")
-        for i in range(len(self.range) - 1):
-            if self.range[i].y < 0 and self.range[i + 1].y > 0:
-                print(f"Cross the y-axis between {self.range[i]} and {self.range[i+1]}")
-                return
+        for current in points:
+            if previous.y < 0 and current.y > 0:
+                print(f"Cross the y-axis between {previous} and {current}")
+                return True
+            previous = current
         print(f"don't Cross the y-axis")
+        return False
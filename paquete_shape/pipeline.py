@@ -0,0 +1,207 @@
+import argparse
+import csv
+import json
+import math
+import sys
+from itertools import islice
+from .shape import ShapeError
+from .triangle_batch import TriangleBatch
+
+class InvalidRecordError(ShapeError):
+    def __init__(self, line, reason):
+        self.line = line
+        self.reason = reason
+        super().__init__(f"Registro invalido en la linea {line}: {reason}")
+
+FIELDS = {
+    'rectangle': ('x', 'y', 'width', 'height'),
+    'triangle': ('ax', 'ay', 'bx', 'by', 'cx', 'cy'),
+}
+
+def detect_format(path):
+    if path.endswith('.csv'):
+        return 'csv'
+    if path.endswith(('.ndjson', '.jsonl')):
+        return 'ndjson'
+    raise ShapeError(f"No se reconoce el formato de {path}, usa .csv o .ndjson")
+
+class _LineDecoder:
+    # las lineas de un archivo binario se decodifican una por una; una linea que no se puede
+    # decodificar se anota en invalid y se cambia por una linea vacia para no cortar la lectura
+    def __init__(self, file, encoding = 'utf-8'):
+        self.file = file
+        self.encoding = encoding
+        self.line = 0
+        self.invalid = []
+    def __iter__(self):
+        return self
+    def __next__(self):
+        raw = next(self.file)
+        self.line += 1
+        if isinstance(raw, str):
+            return raw
+        try:
+            return raw.decode(self.encoding)
+        except UnicodeDecodeError as error:
+            self.invalid.append(InvalidRecordError(self.line, f"la linea no es {self.encoding} valido: {error.reason}"))
+            return '\n'
+
+def read_records(file, format):
+    # genera (linea, registro); registro es un dict o un InvalidRecordError si la linea no se pudo leer.
+    # file puede estar abierto en modo texto o binario (en binario cada linea se decodifica como utf-8)
+    lines = _LineDecoder(file)
+    invalid = lines.invalid
+    if format == 'csv':
+        reader = csv.DictReader(lines)
+        while True:
+            try:
+                record = next(reader)
+            except StopIteration:
+                break
+            except csv.Error as error:
+                # el lector de csv sigue en la linea siguiente
+                record = InvalidRecordError(lines.line, f"CSV invalido: {error}")
+            for error in invalid:
+                yield error.line, error
+            invalid.clear()
+            yield (record.line if isinstance(record, InvalidRecordError) else reader.line_num), record
+        for error in invalid:
+            yield error.line, error
+    elif format == 'ndjson':
+        for text in lines:
+            line = lines.line
+            if invalid:
+                yield line, invalid.pop()
+                continue
+            if not text.strip():
+                continue
+            try:
+                record = json.loads(text)
+            except ValueError as error:
+                yield line, InvalidRecordError(line, f"JSON invalido: {error}")
+                continue
+            if not isinstance(record, dict):
+                yield line, InvalidRecordError(line, "se esperaba un objeto")
+                continue
+            yield line, record
+    else:
+        raise ShapeError(f"Formato desconocido: {format}")
+
+def parse_record(line, record):
+    kind = str(record.get('tipo') or record.get('type') or '').strip().lower()
+    if kind not in FIELDS:
+        raise InvalidRecordError(line, f"tipo desconocido '{kind}'")
+    values = []
+    for field in FIELDS[kind]:
+        try:
+            value = float(record[field])
+        except KeyError:
+            raise InvalidRecordError(line, f"falta el campo '{field}'")
+        except (TypeError, ValueError):
+            raise InvalidRecordError(line, f"valor invalido en '{field}': {record[field]!r}")
+        if not math.isfinite(value):
+            raise InvalidRecordError(line, f"valor no finito en '{field}'")
+        values.append(value)
+    if kind == 'rectangle' and (values[2] <= 0 or values[3] <= 0):
+        raise InvalidRecordError(line, "ancho y alto deben ser positivos")
+    return kind, values
+
+def _rectangle_metrics(values):
+    x, y, width, height = values
+    return {
+        'area': width * height,
+        'perimeter': 2 * width + 2 * height,
+        'center': [x + width / 2, y + height / 2],
+        'inner_angles': [90, 90, 90, 90],
+    }
+
+def triangle_metrics(triangles):
+    # metricas de muchos triangulos dados como (ax, ay, bx, by, cx, cy), en el mismo orden
+    batch = TriangleBatch()
+    for values in triangles:
+        for column, value in zip((batch.ax, batch.ay, batch.bx, batch.by, batch.cx, batch.cy), values):
+            column.append(value)
+    perimeters = batch.compute_perimeters()
+    areas = batch.compute_areas()
+    angles = batch.compute_inner_angles()
+    for i, (ax, ay, bx, by, cx, cy) in enumerate(triangles):
+        yield {
+            'area': areas[i],
+            'perimeter': perimeters[i],
+            'center': [(ax + bx + cx) / 3, (ay + by + cy) / 3],
+            'inner_angles': [angle[i] for angle in angles],
+        }
+
+def compute_metrics(records, chunk_size = 1000):
+    # por bloques: la memoria depende de chunk_size, no del tamano del archivo
+    if chunk_size <= 0:
+        raise ShapeError("El tamano de bloque debe ser positivo")
+    records = iter(records)
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            return
+        parsed = []
+        triangles = []
+        for line, record in chunk:
+            if isinstance(record, InvalidRecordError):
+                parsed.append((line, record, None, None))
+                continue
+            try:
+                kind, values = parse_record(line, record)
+            except InvalidRecordError as error:
+                parsed.append((line, error, None, None))
+                continue
+            if kind == 'triangle':
+                if (values[2] - values[0]) * (values[5] - values[1]) == (values[3] - values[1]) * (values[4] - values[0]):
+                    parsed.append((line, InvalidRecordError(line, "los vertices del triangulo son colineales"), None, None))
+                    continue
+                triangles.append(values)
+            parsed.append((line, record, kind, values))
+        triangle_results = triangle_metrics(triangles) if triangles else iter(())
+        for line, record, kind, values in parsed:
+            if kind is None:
+                yield record
+                continue
+            metrics = next(triangle_results) if kind == 'triangle' else _rectangle_metrics(values)
+            result = {'line': line}
+            if 'id' in record:
+                result['id'] = record['id']
+            result['tipo'] = kind
+            result.update(metrics)
+            yield result
+
+def _report(error):
+    print(f"Advertencia: {error}", file=sys.stderr)
+
+def process_file(input_path, output_path, format = None, chunk_size = 1000, on_error = None):
+    if format is None:
+        format = detect_format(input_path)
+    if on_error is None:
+        on_error = _report
+    processed = 0
+    errors = 0
+    with open(input_path, 'rb') as source, open(output_path, 'w', encoding='utf-8') as target:
+        for result in compute_metrics(read_records(source, format), chunk_size):
+            if isinstance(result, InvalidRecordError):
+                errors += 1
+                on_error(result)
+                continue
+            target.write(json.dumps(result))
+            target.write('\n')
+            processed += 1
+    return processed, errors
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Calcula metricas de figuras desde CSV/NDJSON y las escribe como NDJSON")
+    parser.add_argument("entrada")
+    parser.add_argument("salida")
+    parser.add_argument("--formato", choices=["csv", "ndjson"])
+    parser.add_argument("--bloque", type=int, default=1000)
+    args = parser.parse_args()
+    try:
+        procesados, errores = process_file(args.entrada, args.salida, args.formato, args.bloque)
+        print(f"Registros procesados: {procesados}, con errores: {errores}")
+    except (ShapeError, OSError) as error:
+        print(f"Ocurrio un error: {error}")
+        sys.exit(1)
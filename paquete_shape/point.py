@@ -1,15 +1,29 @@
 import math
 
+TOLERANCE = 1e-10
+
 class InvalidPointError(Exception):
     pass
 
+def _snap(value):
+    # celda de la rejilla de tolerancia; igualdad y hash usan la misma clave
+    cell = value / TOLERANCE
+    return round(cell) if math.isfinite(cell) else value
+
 class Point:
+    __slots__ = ('x', 'y')
     def __init__(self, x, y):
         try:
-            self.x = float(x)
-            self.y = float(y)
+            object.__setattr__(self, 'x', float(x))
+            object.__setattr__(self, 'y', float(y))
         except Exception:
             raise InvalidPointError("Coordenadas invalidas")
+    def __setattr__(self, name, value):
+        raise InvalidPointError("Point es inmutable, usa another_point")
+    def __delattr__(self, name):
+        raise InvalidPointError("Point es inmutable")
+    def __reduce__(self):
+        return (Point, (self.x, self.y))
     def another_point(self, new_x, new_y):
         return Point(new_x, new_y)
     def distance_to(self, other):
@@ -18,7 +32,24 @@ class Point:
         dx = self.x - other.x
         dy = self.y - other.y
         return (dx**2 + dy**2) ** 0.5
+    def key(self):
+        return (_snap(self.x), _snap(self.y))
     def __str__(self):
         return f"Point({self.x}, {self.y})"
     def __eq__(self, other):
-        return isinstance(other, Point) and abs(self.x - other.x) < 1e-10 and abs(self.y - other.y) < 1e-10
\ No newline at end of file
+        return isinstance(other, Point) and self.key() == other.key()
+    def __hash__(self):
+        return hash(self.key())
+
+class PointPool:
+    def __init__(self):
+        self._points = {}
+    def intern(self, x, y = None):
+        point = x if isinstance(x, Point) else Point(x, y)
+        return self._points.setdefault(point.key(), point)
+    def __len__(self):
+        return len(self._points)
+    def __contains__(self, point):
+        return isinstance(point, Point) and point.key() in self._points
+    def clear(self):
+        self._points.clear()
@@ -0,0 +1,65 @@
+from array import array
+from math import hypot
+from .point import Point, InvalidPointError
+
+class PointArray:
+    def __init__(self, xs = (), ys = ()):
+        try:
+            self.xs = array('d', xs)
+            self.ys = array('d', ys)
+        except Exception:
+            raise InvalidPointError("Coordenadas invalidas")
+        if len(self.xs) != len(self.ys):
+            raise InvalidPointError("xs y ys deben tener la misma longitud")
+    @classmethod
+    def from_points(cls, points):
+        xs = array('d')
+        ys = array('d')
+        for point in points:
+            if not isinstance(point, Point):
+                raise InvalidPointError("Se esperaba Point")
+            xs.append(point.x)
+            ys.append(point.y)
+        return cls(xs, ys)
+    def to_points(self):
+        return [Point(x, y) for x, y in zip(self.xs, self.ys)]
+    def append(self, x, y):
+        try:
+            self.xs.append(float(x))
+            self.ys.append(float(y))
+        except Exception:
+            raise InvalidPointError("Coordenadas invalidas")
+    def __len__(self):
+        return len(self.xs)
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return PointArray(self.xs[index], self.ys[index])
+        return Point(self.xs[index], self.ys[index])
+    def __iter__(self):
+        return (Point(x, y) for x, y in zip(self.xs, self.ys))
+    def distance_to(self, point: "Point"):
+        if not isinstance(point, Point):
+            raise InvalidPointError("Se esperaba Point")
+        px = point.x
+        py = point.y
+        return array('d', map(hypot, [x - px for x in self.xs], [y - py for y in self.ys]))
+    def distances(self, other: "PointArray"):
+        if not isinstance(other, PointArray):
+            raise InvalidPointError("Se esperaba PointArray")
+        if len(self) != len(other):
+            raise InvalidPointError("Los arreglos deben tener la misma longitud")
+        dxs = [a - b for a, b in zip(self.xs, other.xs)]
+        dys = [a - b for a, b in zip(self.ys, other.ys)]
+        return array('d', map(hypot, dxs, dys))
+    def distance_matrix(self, other: "PointArray" = None):
+        if other is None:
+            other = self
+        if not isinstance(other, PointArray):
+            raise InvalidPointError("Se esperaba PointArray")
+        # una fila contigua por cada punto de self
+        matrix = []
+        for px, py in zip(self.xs, self.ys):
+            matrix.append(array('d', map(hypot, [x - px for x in other.xs], [y - py for y in other.ys])))
+        return matrix
+    def __str__(self):
+        return f"PointArray(n={len(self)})"
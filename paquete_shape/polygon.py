@@ -0,0 +1,141 @@
+from array import array
+from math import atan2, degrees, hypot, pi
+from .shape import Shape, ShapeError
+from .point import Point, InvalidPointError
+from .point_array import PointArray
+from .line import Line
+
+class InvalidPolygonError(ShapeError):
+    pass
+
+def _segments_cross(ax, ay, bx, by, cx, cy, dx, dy):
+    # interseccion cerrada de los segmentos AB y CD, incluidos toques y solapes colineales
+    d1 = (dx - cx) * (ay - cy) - (dy - cy) * (ax - cx)
+    d2 = (dx - cx) * (by - cy) - (dy - cy) * (bx - cx)
+    d3 = (bx - ax) * (cy - ay) - (by - ay) * (cx - ax)
+    d4 = (bx - ax) * (dy - ay) - (by - ay) * (dx - ax)
+    if ((d1 > 0 and d2 < 0) or (d1 < 0 and d2 > 0)) and ((d3 > 0 and d4 < 0) or (d3 < 0 and d4 > 0)):
+        return True
+    def on_segment(px, py, qx, qy, rx, ry):
+        return min(px, qx) <= rx <= max(px, qx) and min(py, qy) <= ry <= max(py, qy)
+    return ((d1 == 0 and on_segment(cx, cy, dx, dy, ax, ay)) or
+            (d2 == 0 and on_segment(cx, cy, dx, dy, bx, by)) or
+            (d3 == 0 and on_segment(ax, ay, bx, by, cx, cy)) or
+            (d4 == 0 and on_segment(ax, ay, bx, by, dx, dy)))
+
+class Polygon(Shape):
+    def __init__(self, vertices):
+        # no pasa por Shape.__init__: los lados salen de los vertices, no se asignan
+        self._set_vertices(vertices)
+        self.inner_angles = []
+    def _set_vertices(self, vertices):
+        if isinstance(vertices, PointArray):
+            xs = array('d', vertices.xs)
+            ys = array('d', vertices.ys)
+        else:
+            try:
+                points = PointArray.from_points(vertices)
+            except InvalidPointError:
+                raise InvalidPolygonError("Los vertices deben ser Point")
+            xs = points.xs
+            ys = points.ys
+        if len(xs) < 3:
+            raise InvalidPolygonError("Un poligono necesita al menos 3 vertices")
+        for i in range(len(xs)):
+            if Point(xs[i], ys[i]) == Point(xs[i - 1], ys[i - 1]):
+                raise InvalidPolygonError("Dos vertices consecutivos no pueden ser iguales")
+        self.xs = xs
+        self.ys = ys
+        self._cache = {}
+    @classmethod
+    def from_edges(cls, edges):
+        if len(edges) < 3:
+            raise InvalidPolygonError("Un poligono necesita al menos 3 lados")
+        for i, edge in enumerate(edges):
+            if not isinstance(edge, Line):
+                raise InvalidPolygonError(f"El lado {i} no es una Line")
+            if edges[i - 1].final != edge.inicio:
+                raise InvalidPolygonError(f"El lado {i} no empieza donde termina el anterior")
+        return cls([edge.inicio for edge in edges])
+    @property
+    def edges(self):
+        return self._cached('edges', lambda: [Line(Point(x0, y0), Point(x1, y1)) for x0, y0, x1, y1 in self._segments()])
+    @edges.setter
+    def edges(self, edges):
+        if not isinstance(edges, (list, tuple)):
+            raise InvalidPolygonError("Los lados deben ser una lista de Line")
+        self._set_vertices(Polygon.from_edges(edges).vertices())
+    def vertices(self):
+        return PointArray(self.xs, self.ys)
+    def __len__(self):
+        return len(self.xs)
+    def _segments(self):
+        xs = self.xs
+        ys = self.ys
+        return zip(xs, ys, xs[1:] + xs[:1], ys[1:] + ys[:1])
+    def compute_signed_area(self):
+        return self._cached('signed_area', lambda: sum(x0 * y1 - x1 * y0 for x0, y0, x1, y1 in self._segments()) / 2)
+    def compute_area(self):
+        return abs(self.compute_signed_area())
+    def compute_perimeter(self):
+        return self._cached('perimeter', lambda: sum(hypot(x1 - x0, y1 - y0) for x0, y0, x1, y1 in self._segments()))
+    def compute_centroid(self):
+        return self._cached('centroid', self._compute_centroid)
+    def _compute_centroid(self):
+        signed_area = self.compute_signed_area()
+        if signed_area == 0:
+            raise InvalidPolygonError("Area nula, el centroide no esta definido")
+        cx = 0.0
+        cy = 0.0
+        for x0, y0, x1, y1 in self._segments():
+            cross = x0 * y1 - x1 * y0
+            cx += (x0 + x1) * cross
+            cy += (y0 + y1) * cross
+        return Point(cx / (6 * signed_area), cy / (6 * signed_area))
+    def _turns(self):
+        # giro con signo en cada vertice i, entre el lado que llega y el que sale
+        xs = self.xs
+        ys = self.ys
+        n = len(xs)
+        turns = []
+        for i in range(n):
+            ax = xs[i] - xs[i - 1]
+            ay = ys[i] - ys[i - 1]
+            bx = xs[(i + 1) % n] - xs[i]
+            by = ys[(i + 1) % n] - ys[i]
+            turns.append(atan2(ax * by - ay * bx, ax * bx + ay * by))
+        return turns
+    def compute_inner_angles(self):
+        orientation = 1 if self.compute_signed_area() >= 0 else -1
+        self.inner_angles = [degrees(pi - orientation * turn) for turn in self._turns()]
+        return self.inner_angles
+    def is_convex(self):
+        turns = self._turns()
+        if any(turn > 0 for turn in turns) and any(turn < 0 for turn in turns):
+            return False
+        # con giros de un solo signo, una estrella da varias vueltas: el giro total debe ser una vuelta
+        return abs(abs(sum(turns)) - 2 * pi) < 1e-9
+    def is_simple(self):
+        return self._cached('simple', self._compute_simple)
+    def _compute_simple(self):
+        segments = list(self._segments())
+        n = len(segments)
+        order = sorted(range(n), key=lambda i: min(segments[i][0], segments[i][2]))
+        active = []
+        for i in order:
+            ax, ay, bx, by = segments[i]
+            left = min(ax, bx)
+            active = [j for j in active if max(segments[j][0], segments[j][2]) >= left]
+            for j in active:
+                cx, cy, dx, dy = segments[j]
+                if (i - j) % n in (1, n - 1):
+                    # lados vecinos: solo comparten el vertice comun, salvo que se doblen sobre si mismos
+                    if (ax - bx) * (cy - dy) == (ay - by) * (cx - dx) and (ax - bx) * (cx - dx) + (ay - by) * (cy - dy) < 0:
+                        return False
+                    continue
+                if _segments_cross(ax, ay, bx, by, cx, cy, dx, dy):
+                    return False
+            active.append(i)
+        return True
+    def __str__(self):
+        return f"Polygon(vertices={len(self)})"
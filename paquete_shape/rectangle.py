@@ -2,6 +2,7 @@ import math
 from .shape import Shape, ShapeError, GeometricCalculationError
 from .line import Line, InvalidLineError
 from .point import Point, InvalidPointError
+from .point_array import PointArray
 
 class InvalidDimensionError(ShapeError):
     pass
@@ -9,43 +10,121 @@ class InvalidDimensionError(ShapeError):
 class InvalidRectangleError(Exception):
     pass
 
+def clip_segment(bounds, x0, y0, x1, y1):
+    # Liang-Barsky: devuelve (t0, t1) del tramo dentro de bounds o None
+    xmin, ymin, xmax, ymax = bounds
+    dx = x1 - x0
+    dy = y1 - y0
+    t0 = 0.0
+    t1 = 1.0
+    for p, q in ((-dx, x0 - xmin), (dx, xmax - x0), (-dy, y0 - ymin), (dy, ymax - y0)):
+        if p == 0:
+            if q < 0:
+                return None
+            continue
+        r = q / p
+        if p < 0:
+            if r > t1:
+                return None
+            if r > t0:
+                t0 = r
+        else:
+            if r < t0:
+                return None
+            if r < t1:
+                t1 = r
+    return (t0, t1)
+
 class Rectangle(Shape):
     def __init__(self, edges = []):
-        self.edges = edges
-        for i in range(len(edges)-1):
-            self.edges[i].compute_length()
-            if (edges[i+1].inicio.x > edges[i].inicio.x and edges[i+1].inicio.y > edges[i].inicio.y):
-                point_bottom_left = i
-            if edges[i].inicio.y == edges[i].final.y:
-                self.width = edges[i].length
-            if edges[i].inicio.x == edges[i].final.x:
-                self.height = edges[i].length
-        self.point_bottom_left = point_bottom_left
-        self.inner_angles = []
+        if not edges:
+            raise InvalidRectangleError("Se necesitan lados para construir el rectangulo")
+        super().__init__(edges)
         self.point_bottom_right = None
         self.point_upper_left = None
         self.point_upper_right = None
+    @classmethod
+    def from_dimensions(cls, x, y, width, height):
+        a = Point(x, y)
+        b = Point(x + width, y)
+        c = Point(x + width, y + height)
+        d = Point(x, y + height)
+        return cls([Line(a, b), Line(b, c), Line(c, d), Line(d, a)])
+    def _compute_dimensions(self):
+        edges = self.edges
+        width = None
+        height = None
+        for i in range(len(edges)-1):
+            if edges[i].inicio.y == edges[i].final.y:
+                width = edges[i].length
+            if edges[i].inicio.x == edges[i].final.x:
+                height = edges[i].length
+        point_bottom_left = Point(min(edge.inicio.x for edge in edges), min(edge.inicio.y for edge in edges))
+        return point_bottom_left, width, height
+    @property
+    def point_bottom_left(self):
+        return self._cached('dimensions', self._compute_dimensions)[0]
+    @property
+    def width(self):
+        # AttributeError para que hasattr(self, 'width') siga indicando si falta la dimension
+        width = self._cached('dimensions', self._compute_dimensions)[1]
+        if width is None:
+            raise AttributeError("width")
+        return width
+    @property
+    def height(self):
+        height = self._cached('dimensions', self._compute_dimensions)[2]
+        if height is None:
+            raise AttributeError("height")
+        return height
+    @property
+    def center(self):
+        return self.compute_center()
+    def _dimensions(self, action):
+        # una sola lectura de la cache; la validacion solo corre cuando se calcula un valor nuevo
+        point, width, height = self._cached('dimensions', self._compute_dimensions)
+        if width is None or height is None:
+            raise InvalidRectangleError(f"Faltan dimensiones para {action}")
+        return point, width, height
     def init_bottom_left(self):
-        if not hasattr(self, 'width') or not hasattr(self, 'height'):
-            raise InvalidRectangleError("Faltan dimensiones para inicializar esquinas")
-        self.point_bottom_right = self.point_bottom_left.another_point(self.point_bottom_left.x + self.width, self.point_bottom_left.y)
-        self.point_upper_left = self.point_bottom_left.another_point(self.point_bottom_left.x, self.point_bottom_left.y + self.height)
-        self.point_upper_right = self.point_bottom_left.another_point(self.point_bottom_left.x + self.width, self.point_bottom_left.y + self.height)
-        return [self.point_bottom_left, self.point_bottom_right, self.point_upper_left, self.point_upper_right]
+        point, width, height = self._dimensions("inicializar esquinas")
+        self.point_bottom_right = point.another_point(point.x + width, point.y)
+        self.point_upper_left = point.another_point(point.x, point.y + height)
+        self.point_upper_right = point.another_point(point.x + width, point.y + height)
+        return [point, self.point_bottom_right, self.point_upper_left, self.point_upper_right]
     def compute_center(self):
-        if not hasattr(self, 'width') or not hasattr(self, 'height'):
-            raise InvalidRectangleError("Faltan dimensiones para calcular el centro")
-        return Point(self.point_bottom_left.x + self.width / 2, self.point_bottom_left.y + self.height / 2)
+        return self._cached('center', self._compute_center)
+    def _compute_center(self):
+        point, width, height = self._dimensions("calcular el centro")
+        return Point(point.x + width / 2, point.y + height / 2)
     def compute_area(self):
-        if not hasattr(self, 'width') or not hasattr(self, 'height'):
-            raise InvalidRectangleError("Faltan dimensiones para calcular el area")
-        return self.width * self.height
+        return self._cached('area', self._compute_area)
+    def _compute_area(self):
+        _, width, height = self._dimensions("calcular el area")
+        return width * height
     def compute_perimeter(self):
-        if not hasattr(self, 'width') or not hasattr(self, 'height'):
-            raise InvalidRectangleError("Faltan dimensiones para calcular el perimetro")
-        return 2 * self.width + 2 * self.height
+        return self._cached('perimeter', self._compute_perimeter)
+    def _compute_perimeter(self):
+        _, width, height = self._dimensions("calcular el perimetro")
+        return 2 * width + 2 * height
     def compute_inner_angles(self):
         self.inner_angles = [90, 90, 90, 90]
+    def compute_bounds(self):
+        return self._cached('bounds', self._compute_bounds)
+    def _compute_bounds(self):
+        point, width, height = self._dimensions("calcular los limites")
+        return (point.x, point.y, point.x + width, point.y + height)
+    def intersects_with_rectangle(self, other: "Rectangle"):
+        if not isinstance(other, Rectangle):
+            raise InvalidRectangleError("Se esperaba Rectangle")
+        xmin_1, ymin_1, xmax_1, ymax_1 = self.compute_bounds()
+        xmin_2, ymin_2, xmax_2, ymax_2 = other.compute_bounds()
+        return xmin_1 <= xmax_2 and xmin_2 <= xmax_1 and ymin_1 <= ymax_2 and ymin_2 <= ymax_1
+    def contains_points(self, points: "PointArray"):
+        if not isinstance(points, PointArray):
+            raise InvalidPointError("Se esperaba PointArray")
+        xmin, ymin, xmax, ymax = self.compute_bounds()
+        return bytearray([xmin <= x <= xmax and ymin <= y <= ymax for x, y in zip(points.xs, points.ys)])
     def compute_interference_between_2_rectangles(self, square_2: "Rectangle"):
         if not hasattr(self, 'center') or not hasattr(square_2, 'center'):
             raise InvalidRectangleError("Faltan centros para calcular interferencia")
@@ -74,20 +153,27 @@ class Rectangle(Shape):
         else:
             print(f"no interfieren")
     def compute_interference_between_rectangle_and_line(self, line: "Line"):
-        if not hasattr(self, 'center'):
-            raise InvalidRectangleError("Falta centro para calcular interferencia")
-        centro_1 = self.center
-        line = line.range_of_the_line()
-        interfieren = False
-        for i in range(len(line)):
-            distancia = (((line[i].x - centro_1.x))**2 +(line[i].y - centro_1.y)**2)**0.5
-            cateto_opuesto = line[i].y - centro_1.y
-            coseno = cateto_opuesto / distancia
-            if coseno == 0:
-                hipotenusa_square_1 = self.width / 2
-            else:
-                hipotenusa_square_1 = abs(cateto_opuesto / coseno)
-            if distancia <= hipotenusa_square_1:
-                interfieren = True
-                break
-        return interfieren
+        return self.intersects_line(line)
+    def intersects_line(self, line: "Line"):
+        if not isinstance(line, Line):
+            raise InvalidLineError("Se esperaba Line")
+        return clip_segment(self.compute_bounds(), line.inicio.x, line.inicio.y, line.final.x, line.final.y) is not None
+    def intersects_lines(self, lines):
+        bounds = self.compute_bounds()
+        result = []
+        for line in lines:
+            if not isinstance(line, Line):
+                raise InvalidLineError("Se esperaba Line")
+            result.append(clip_segment(bounds, line.inicio.x, line.inicio.y, line.final.x, line.final.y) is not None)
+        return result
+
+def rectangles_intersecting_line(rectangles, line: "Line"):
+    if not isinstance(line, Line):
+        raise InvalidLineError("Se esperaba Line")
+    x0, y0, x1, y1 = line.inicio.x, line.inicio.y, line.final.x, line.final.y
+    result = []
+    for rectangle in rectangles:
+        if not isinstance(rectangle, Rectangle):
+            raise InvalidRectangleError("Se esperaba Rectangle")
+        result.append(clip_segment(rectangle.compute_bounds(), x0, y0, x1, y1) is not None)
+    return result
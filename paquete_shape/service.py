@@ -0,0 +1,245 @@
+import argparse
+import asyncio
+import json
+import math
+import sys
+from array import array
+from .shape import ShapeError
+from .point_array import PointArray
+from .pipeline import triangle_metrics
+
+class ServiceError(ShapeError):
+    pass
+
+# protocolo: una peticion JSON por linea y una respuesta JSON por linea con el mismo id
+#   {"id": 1, "op": "distance", "a": [x, y], "b": [x, y]}
+#   {"id": 2, "op": "rectangle_interference", "a": [x, y, ancho, alto], "b": [x, y, ancho, alto]}
+#   {"id": 3, "op": "triangle_metrics", "points": [[ax, ay], [bx, by], [cx, cy]]}
+# las respuestas de una misma conexion pueden llegar en otro orden que las peticiones
+
+def _numbers(value, size, field):
+    if not isinstance(value, list) or len(value) != size:
+        raise ServiceError(f"'{field}' debe ser una lista de {size} numeros")
+    numbers = []
+    for item in value:
+        if isinstance(item, bool) or not isinstance(item, (int, float)):
+            raise ServiceError(f"'{field}' contiene un valor invalido: {item!r}")
+        try:
+            number = float(item)
+        except OverflowError:
+            # un entero JSON demasiado grande para un float
+            raise ServiceError(f"'{field}' contiene un valor fuera de rango")
+        if not math.isfinite(number):
+            raise ServiceError(f"'{field}' contiene un valor invalido: {item!r}")
+        numbers.append(number)
+    return numbers
+
+def _parse_distance(request):
+    return _numbers(request.get('a'), 2, 'a') + _numbers(request.get('b'), 2, 'b')
+
+def _parse_rectangles(request):
+    values = _numbers(request.get('a'), 4, 'a') + _numbers(request.get('b'), 4, 'b')
+    if values[2] <= 0 or values[3] <= 0 or values[6] <= 0 or values[7] <= 0:
+        raise ServiceError("ancho y alto deben ser positivos")
+    return values
+
+def _parse_triangle(request):
+    points = request.get('points')
+    if not isinstance(points, list) or len(points) != 3:
+        raise ServiceError("'points' debe tener 3 puntos")
+    values = []
+    for point in points:
+        values.extend(_numbers(point, 2, 'points'))
+    if (values[2] - values[0]) * (values[5] - values[1]) == (values[3] - values[1]) * (values[4] - values[0]):
+        raise ServiceError("los vertices del triangulo son colineales")
+    return values
+
+# cada lote es una lista de valores ya validados y devuelve un resultado por valor, en el mismo orden
+
+def _distance_batch(batch):
+    first = PointArray(array('d', [values[0] for values in batch]), array('d', [values[1] for values in batch]))
+    second = PointArray(array('d', [values[2] for values in batch]), array('d', [values[3] for values in batch]))
+    return list(first.distances(second))
+
+def _rectangle_batch(batch):
+    # mismo criterio que Rectangle.intersects_with_rectangle: los bordes que se tocan cuentan
+    return [x1 <= x2 + w2 and x2 <= x1 + w1 and y1 <= y2 + h2 and y2 <= y1 + h1
+            for x1, y1, w1, h1, x2, y2, w2, h2 in batch]
+
+def _triangle_batch(batch):
+    return list(triangle_metrics(batch))
+
+OPERATIONS = {
+    'distance': (_parse_distance, _distance_batch),
+    'rectangle_interference': (_parse_rectangles, _rectangle_batch),
+    'triangle_metrics': (_parse_triangle, _triangle_batch),
+}
+
+class MicroBatcher:
+    # junta las peticiones de una operacion que llegan dentro de la ventana y las calcula en un solo lote
+    def __init__(self, compute, window = 0.001, max_batch = 1024):
+        if window < 0:
+            raise ServiceError("La ventana no puede ser negativa")
+        if max_batch <= 0:
+            raise ServiceError("El tamano maximo de lote debe ser positivo")
+        self.compute = compute
+        self.window = window
+        self.max_batch = max_batch
+        self.batches = 0
+        self.items = 0
+        self._values = []
+        self._futures = []
+        self._timer = None
+    def submit(self, values):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._values.append(values)
+        self._futures.append(future)
+        if len(self._values) >= self.max_batch:
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self.flush)
+        return future
+    def flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        values = self._values
+        futures = self._futures
+        if not values:
+            return
+        self._values = []
+        self._futures = []
+        self.batches += 1
+        self.items += len(values)
+        try:
+            results = self.compute(values)
+        except Exception as error:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(ServiceError(f"Error al calcular el lote: {error}"))
+            return
+        for future, result in zip(futures, results):
+            if not future.done():
+                future.set_result(result)
+
+class GeometryServer:
+    def __init__(self, host = "127.0.0.1", port = 8765, window = 0.001, max_batch = 1024, line_limit = 1 << 16):
+        self.host = host
+        self.port = port
+        self.line_limit = line_limit
+        self.batchers = {name: MicroBatcher(compute, window, max_batch) for name, (parse, compute) in OPERATIONS.items()}
+        self._server = None
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port, limit=self.line_limit)
+        # con port = 0 el sistema elige un puerto libre
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        for batcher in self.batchers.values():
+            batcher.flush()
+    async def _handle(self, reader, writer):
+        # las respuestas se escriben desde el callback de cada futuro, sin una tarea por peticion
+        pending = set()
+        try:
+            while True:
+                line = await _read_line(reader)
+                if line is None:
+                    _reply(writer, {'id': None, 'error': f"linea de mas de {self.line_limit} bytes, ignorada"})
+                elif not line:
+                    break
+                elif line.strip():
+                    self._dispatch(line, writer, pending)
+                # si el cliente no lee sus respuestas tampoco se le leen mas peticiones
+                await writer.drain()
+            if pending:
+                await asyncio.wait(pending)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+    def _dispatch(self, line, writer, pending):
+        request_id = None
+        try:
+            try:
+                request = json.loads(line)
+            except ValueError as error:
+                raise ServiceError(f"JSON invalido: {error}")
+            if not isinstance(request, dict):
+                raise ServiceError("se esperaba un objeto")
+            request_id = request.get('id')
+            operation = request.get('op')
+            if not isinstance(operation, str) or operation not in OPERATIONS:
+                raise ServiceError(f"operacion desconocida '{operation}'")
+            values = OPERATIONS[operation][0](request)
+        except (ShapeError, ValueError, OverflowError) as error:
+            _reply(writer, {'id': request_id, 'error': str(error)})
+            return
+        future = self.batchers[operation].submit(values)
+        pending.add(future)
+        future.add_done_callback(lambda done: _deliver(writer, request_id, done, pending))
+    def __str__(self):
+        return f"GeometryServer({self.host}:{self.port})"
+
+async def _read_line(reader):
+    # una linea completa, b'' al final de la conexion o None si la linea supera el limite del reader;
+    # una linea demasiado larga se descarta hasta su salto de linea y la conexion sigue abierta
+    try:
+        return await reader.readuntil(b'\n')
+    except asyncio.IncompleteReadError as error:
+        return error.partial
+    except asyncio.LimitOverrunError as error:
+        consumed = error.consumed
+    while True:
+        await reader.readexactly(consumed)
+        try:
+            await reader.readuntil(b'\n')
+            return None
+        except asyncio.IncompleteReadError:
+            return None
+        except asyncio.LimitOverrunError as error:
+            consumed = error.consumed
+
+def _reply(writer, response):
+    if not writer.is_closing():
+        writer.write(json.dumps(response).encode() + b'\n')
+
+def _deliver(writer, request_id, future, pending):
+    pending.discard(future)
+    if future.cancelled():
+        return
+    error = future.exception()
+    if error is not None:
+        _reply(writer, {'id': request_id, 'error': str(error)})
+    else:
+        _reply(writer, {'id': request_id, 'result': future.result()})
+
+async def _serve(server):
+    await server.start()
+    # con --puerto 0 esta linea es la forma de saber que puerto se eligio
+    print(f"Escuchando en {server.host}:{server.port}", flush=True)
+    await server.serve_forever()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servicio JSON sobre TCP para calculos de paquete_shape")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=8765)
+    parser.add_argument("--ventana-ms", type=float, default=1.0)
+    parser.add_argument("--lote-max", type=int, default=1024)
+    args = parser.parse_args()
+    try:
+        asyncio.run(_serve(GeometryServer(args.host, args.puerto, args.ventana_ms / 1000, args.lote_max)))
+    except KeyboardInterrupt:
+        pass
+    except (ShapeError, OSError) as error:
+        print(f"Ocurrio un error: {error}")
+        sys.exit(1)
@@ -15,6 +15,31 @@ class Shape:
         self.edges = edges
         self.inner_angles = []
 
+    @property
+    def edges(self):
+        return self._edges
+
+    @edges.setter
+    def edges(self, edges):
+        # cada lado avisa a sus figuras cuando cambia un extremo (Line._touch), asi leer la cache es
+        # una sola busqueda; si la lista se modifica en el lugar hay que reasignarla o llamar a invalidate()
+        self._edges = edges
+        for edge in edges or ():
+            watch = getattr(edge, '_watch', None)
+            if watch is not None:
+                watch(self)
+        self._cache = {}
+
+    def _cached(self, name, compute):
+        cache = self._cache
+        if name in cache:
+            return cache[name]
+        value = cache[name] = compute()
+        return value
+
+    def invalidate(self):
+        self._cache = {}
+
     def compute_area(self):
         raise ShapeError("Metodo no implementado")
 
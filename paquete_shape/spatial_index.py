@@ -0,0 +1,138 @@
+from array import array
+from math import floor
+from .shape import ShapeError
+from .point import Point, InvalidPointError
+from .point_array import PointArray
+from .rectangle import Rectangle, InvalidRectangleError
+
+class SpatialIndexError(ShapeError):
+    pass
+
+# un rectangulo que cubre mas celdas que esto no se reparte en la grilla: se revisa aparte en cada consulta
+LARGE_CELLS = 4096
+
+class GridIndex:
+    def __init__(self, rectangles = (), cell_size = None):
+        rectangles = list(rectangles)
+        for rectangle in rectangles:
+            if not isinstance(rectangle, Rectangle):
+                raise InvalidRectangleError("Se esperaba Rectangle")
+        if cell_size is None:
+            cell_size = self._default_cell_size(rectangles)
+        if cell_size <= 0:
+            raise SpatialIndexError("El tamano de celda debe ser positivo")
+        self.cell_size = float(cell_size)
+        self.rectangles = []
+        # xmin, ymin, xmax, ymax de cada rectangulo, en orden de insercion
+        self.bounds = array('d')
+        self.cells = {}
+        # indices de los rectangulos que no estan en la grilla, en orden de insercion
+        self.large = []
+        # celdas minima y maxima ocupadas, para recortar las consultas
+        self._extent = None
+        for rectangle in rectangles:
+            self.insert(rectangle)
+    @staticmethod
+    def _default_cell_size(rectangles):
+        if not rectangles:
+            return 1.0
+        total = 0.0
+        for rectangle in rectangles:
+            total += max(rectangle.width, rectangle.height)
+        return total / len(rectangles) or 1.0
+    def _cell_range(self, xmin, ymin, xmax, ymax):
+        size = self.cell_size
+        return floor(xmin / size), floor(ymin / size), floor(xmax / size), floor(ymax / size)
+    def insert(self, rectangle: "Rectangle"):
+        if not isinstance(rectangle, Rectangle):
+            raise InvalidRectangleError("Se esperaba Rectangle")
+        index = len(self.rectangles)
+        xmin, ymin, xmax, ymax = rectangle.compute_bounds()
+        self.rectangles.append(rectangle)
+        self.bounds.extend((xmin, ymin, xmax, ymax))
+        cx0, cy0, cx1, cy1 = self._cell_range(xmin, ymin, xmax, ymax)
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) > LARGE_CELLS:
+            self.large.append(index)
+            return index
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                self.cells.setdefault((cx, cy), []).append(index)
+        if self._extent is None:
+            self._extent = (cx0, cy0, cx1, cy1)
+        else:
+            ex0, ey0, ex1, ey1 = self._extent
+            self._extent = (min(ex0, cx0), min(ey0, cy0), max(ex1, cx1), max(ey1, cy1))
+        return index
+    def __len__(self):
+        return len(self.rectangles)
+    def query_box(self, xmin, ymin, xmax, ymax):
+        if xmin > xmax or ymin > ymax:
+            raise SpatialIndexError("Caja invalida")
+        bounds = self.bounds
+        found = set()
+        seen = set()
+        for index in self._candidates(xmin, ymin, xmax, ymax):
+            if index in seen:
+                continue
+            seen.add(index)
+            k = 4 * index
+            if bounds[k] <= xmax and xmin <= bounds[k + 2] and bounds[k + 1] <= ymax and ymin <= bounds[k + 3]:
+                found.add(index)
+        return sorted(found)
+    def _candidates(self, xmin, ymin, xmax, ymax):
+        # el costo depende de las celdas ocupadas, no del area de la caja
+        yield from self.large
+        if self._extent is None:
+            return
+        cx0, cy0, cx1, cy1 = self._cell_range(xmin, ymin, xmax, ymax)
+        ex0, ey0, ex1, ey1 = self._extent
+        cx0, cy0, cx1, cy1 = max(cx0, ex0), max(cy0, ey0), min(cx1, ex1), min(cy1, ey1)
+        if cx0 > cx1 or cy0 > cy1:
+            return
+        cells = self.cells
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) > len(cells):
+            for (cx, cy), indices in cells.items():
+                if cx0 <= cx <= cx1 and cy0 <= cy <= cy1:
+                    yield from indices
+            return
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                yield from cells.get((cx, cy), ())
+    def query_rectangle(self, rectangle: "Rectangle"):
+        if not isinstance(rectangle, Rectangle):
+            raise InvalidRectangleError("Se esperaba Rectangle")
+        found = self.query_box(*rectangle.compute_bounds())
+        return [index for index in found if self.rectangles[index] is not rectangle]
+    def query_point(self, point: "Point"):
+        if not isinstance(point, Point):
+            raise InvalidPointError("Se esperaba Point")
+        return self.query_box(point.x, point.y, point.x, point.y)
+    def locate_points(self, points: "PointArray"):
+        # indice del primer rectangulo que contiene cada punto, -1 si ninguno
+        if not isinstance(points, PointArray):
+            raise InvalidPointError("Se esperaba PointArray")
+        bounds = self.bounds
+        cells = self.cells
+        size = self.cell_size
+        large = self.large
+        result = array('q', [-1]) * len(points)
+        for k, (x, y) in enumerate(zip(points.xs, points.ys)):
+            for index in cells.get((floor(x / size), floor(y / size)), ()):
+                b = 4 * index
+                if bounds[b] <= x <= bounds[b + 2] and bounds[b + 1] <= y <= bounds[b + 3]:
+                    result[k] = index
+                    break
+            # un rectangulo grande anterior al encontrado tiene prioridad
+            for index in large:
+                if result[k] != -1 and index > result[k]:
+                    break
+                b = 4 * index
+                if bounds[b] <= x <= bounds[b + 2] and bounds[b + 1] <= y <= bounds[b + 3]:
+                    result[k] = index
+                    break
+        return result
+    def __str__(self):
+        return f"GridIndex(rectangles={len(self)}, cells={len(self.cells)}, large={len(self.large)})"
+
+def locate_points(rectangles, points: "PointArray", cell_size = None):
+    return GridIndex(rectangles, cell_size).locate_points(points)
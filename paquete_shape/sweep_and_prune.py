@@ -0,0 +1,49 @@
+from array import array
+from heapq import heappush, heappop
+from .rectangle import Rectangle, InvalidRectangleError
+
+class SweepAndPrune:
+    def __init__(self):
+        self.pairs_tested = 0
+        self.pairs_found = 0
+    def overlapping_pairs(self, rectangles):
+        xmin = array('d')
+        ymin = array('d')
+        xmax = array('d')
+        ymax = array('d')
+        for rectangle in rectangles:
+            if not isinstance(rectangle, Rectangle):
+                raise InvalidRectangleError("Se esperaba Rectangle")
+            left, bottom, right, top = rectangle.compute_bounds()
+            xmin.append(left)
+            ymin.append(bottom)
+            xmax.append(right)
+            ymax.append(top)
+        return self.overlapping_pairs_from_bounds(xmin, ymin, xmax, ymax)
+    def overlapping_pairs_from_bounds(self, xmin, ymin, xmax, ymax):
+        if not len(xmin) == len(ymin) == len(xmax) == len(ymax):
+            raise InvalidRectangleError("Los limites deben tener la misma longitud")
+        order = sorted(range(len(xmin)), key=xmin.__getitem__)
+        # activos: intervalos en x que siguen abiertos, expirados por xmax
+        active = set()
+        expiry = []
+        pairs = []
+        tested = 0
+        for i in order:
+            left = xmin[i]
+            while expiry and expiry[0][0] < left:
+                active.discard(heappop(expiry)[1])
+            bottom = ymin[i]
+            top = ymax[i]
+            for j in active:
+                tested += 1
+                if ymin[j] <= top and bottom <= ymax[j]:
+                    pairs.append((i, j) if i < j else (j, i))
+            active.add(i)
+            heappush(expiry, (xmax[i], i))
+        pairs.sort()
+        self.pairs_tested = tested
+        self.pairs_found = len(pairs)
+        return pairs
+    def __str__(self):
+        return f"SweepAndPrune(pairs_tested={self.pairs_tested}, pairs_found={self.pairs_found})"
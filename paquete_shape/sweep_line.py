@@ -0,0 +1,271 @@
+from heapq import heappush, heappop
+from math import gcd, isfinite
+from random import Random
+from .shape import ShapeError
+from .point import Point
+from .line import Line, InvalidLineError
+
+class SweepLineError(ShapeError):
+    pass
+
+# Bentley-Ottmann. Los eventos se ordenan por (x, y): una linea vertical se recorre de abajo hacia arriba
+# como si la recta de barrido estuviera apenas girada, asi los segmentos verticales no necesitan pendiente.
+#
+# Todo float es una fraccion con denominador potencia de 2, asi que con una escala comun D = 2**k cada
+# coordenada de entrada es un entero exacto. Un punto se guarda como (NX, NY, W) con x = NX / (W * D)
+# e y = NY / (W * D); los puntos de interseccion tambien tienen esa forma y toda la aritmetica es entera.
+# Las comparaciones se intentan primero en float y solo se repiten en exacto dentro de la tolerancia.
+
+_TOLERANCE = 1e-9
+
+class _Ratio:
+    # num / den con den > 0; solo se compara cuando los float empatan
+    __slots__ = ('num', 'den')
+    def __init__(self, num, den):
+        self.num = num
+        self.den = den
+    def __eq__(self, other):
+        return self.num * other.den == other.num * self.den
+    def __lt__(self, other):
+        return self.num * other.den < other.num * self.den
+    def __gt__(self, other):
+        return self.num * other.den > other.num * self.den
+
+class _Segment:
+    __slots__ = ('index', 'x1', 'y1', 'x2', 'y2', 'X1', 'Y1', 'X2', 'Y2', 'vertical', 'slope', 'start', 'end')
+    def __init__(self, index, a, b, A, B):
+        if B < A:
+            a, b, A, B = b, a, B, A
+        self.index = index
+        self.x1, self.y1 = a
+        self.x2, self.y2 = b
+        self.X1, self.Y1 = A
+        self.X2, self.Y2 = B
+        self.vertical = self.X1 == self.X2
+        self.slope = 0.0 if self.vertical else (self.y2 - self.y1) / (self.x2 - self.x1)
+        self.start = (self.X1, self.Y1, 1)
+        self.end = (self.X2, self.Y2, 1)
+    def compare(self, point, fpx, fpy, known):
+        # signo de y(px) - py; un segmento vertical en el estado siempre contiene al evento,
+        # y known son los segmentos que ya se sabe que pasan por el
+        if self.vertical or self.index in known:
+            return 0
+        fy = self.y1 + self.slope * (fpx - self.x1)
+        tolerance = _TOLERANCE * (abs(self.y1) + abs(fpy) + abs(self.slope) * (abs(fpx) + abs(self.x1)) + 1)
+        if fy - fpy > tolerance:
+            return 1
+        if fpy - fy > tolerance:
+            return -1
+        NX, NY, W = point
+        dx = self.X2 - self.X1
+        left = self.Y1 * W * dx + (NX - self.X1 * W) * (self.Y2 - self.Y1)
+        right = NY * dx
+        return (left > right) - (left < right)
+    def order_after(self):
+        # orden justo a la derecha de un punto comun: por pendiente, los verticales arriba
+        if self.vertical:
+            return (1, 0.0, _Ratio(0, 1), self.index)
+        return (0, self.slope, _Ratio(self.Y2 - self.Y1, self.X2 - self.X1), self.index)
+
+class _Node:
+    __slots__ = ('segment', 'next')
+    def __init__(self, segment, level):
+        self.segment = segment
+        self.next = [None] * level
+
+class _Status:
+    # los segmentos que cortan la recta de barrido, de abajo hacia arriba, en una skip list:
+    # buscar, sacar e insertar cuestan O(log N) esperado en vez del O(N) de una lista
+    MAX_LEVEL = 32
+    def __init__(self):
+        self.head = _Node(None, self.MAX_LEVEL)
+        self.level = 1
+        # semilla fija: el resultado no depende de la suerte, solo el equilibrio de la lista
+        self._random = Random(0)
+    def _random_level(self):
+        bits = self._random.getrandbits(self.MAX_LEVEL - 1)
+        level = 1
+        while bits & 1:
+            level += 1
+            bits >>= 1
+        return level
+    def locate(self, point, fpx, fpy, known):
+        # update[i] es el ultimo nodo del nivel i que queda por debajo del punto;
+        # through son los segmentos que pasan por el, en orden
+        update = [self.head] * self.level
+        node = self.head
+        stop = None
+        for i in range(self.level - 1, -1, -1):
+            following = node.next[i]
+            # el nodo que corto la busqueda en el nivel de arriba ya se sabe que no esta por debajo
+            while following is not None and following is not stop and following.segment.compare(point, fpx, fpy, known) < 0:
+                node = following
+                following = node.next[i]
+            stop = following
+            update[i] = node
+        through = []
+        following = node.next[0]
+        while following is not None and following.segment.compare(point, fpx, fpy, known) == 0:
+            through.append(following)
+            following = following.next[0]
+        return update, through
+    def replace(self, update, through, segments):
+        # cambia los nodos de through (contiguos, justo despues de update) por segments, en ese orden
+        if through:
+            removed = set(through)
+            for i in range(self.level):
+                following = update[i].next[i]
+                while following is not None and following in removed:
+                    following = following.next[i]
+                update[i].next[i] = following
+            while self.level > 1 and self.head.next[self.level - 1] is None:
+                self.level -= 1
+                update.pop()
+        for segment in segments:
+            level = self._random_level()
+            if level > self.level:
+                update.extend([self.head] * (level - self.level))
+                self.level = level
+            node = _Node(segment, level)
+            for i in range(level):
+                node.next[i] = update[i].next[i]
+                update[i].next[i] = node
+                update[i] = node
+
+def _key(point, scale):
+    NX, NY, W = point
+    return (NX / (W * scale), _Ratio(NX, W), NY / (W * scale), _Ratio(NY, W), point)
+
+def _after(point, other):
+    # point va despues de other en el orden (x, y) exacto
+    NX, NY, W = point
+    OX, OY, V = other
+    x = NX * V - OX * W
+    return x > 0 or (x == 0 and NY * V > OY * W)
+
+def _intersection(s, t):
+    # primer punto (en orden de barrido) comun a los dos segmentos, o None
+    if s.x2 < t.x1 or t.x2 < s.x1:
+        return None
+    if max(s.y1, s.y2) < min(t.y1, t.y2) or max(t.y1, t.y2) < min(s.y1, s.y2):
+        return None
+    dx = s.x2 - s.x1
+    dy = s.y2 - s.y1
+    side_1 = dx * (t.y1 - s.y1) - dy * (t.x1 - s.x1)
+    side_2 = dx * (t.y2 - s.y1) - dy * (t.x2 - s.x1)
+    size = max(abs(s.x1), abs(s.y1), abs(s.x2), abs(s.y2), abs(t.x1), abs(t.y1), abs(t.x2), abs(t.y2), 1.0)
+    tolerance = _TOLERANCE * size * size
+    if (side_1 > tolerance and side_2 > tolerance) or (side_1 < -tolerance and side_2 < -tolerance):
+        return None
+    dx1 = s.X2 - s.X1
+    dy1 = s.Y2 - s.Y1
+    dx2 = t.X2 - t.X1
+    dy2 = t.Y2 - t.Y1
+    denom = dx1 * dy2 - dy1 * dx2
+    ex = t.X1 - s.X1
+    ey = t.Y1 - s.Y1
+    if denom == 0:
+        if ex * dy1 - ey * dx1 != 0:
+            return None
+        start = max(s.start, t.start)
+        return start if start <= min(s.end, t.end) else None
+    a = ex * dy2 - ey * dx2
+    b = ex * dy1 - ey * dx1
+    if denom < 0:
+        denom, a, b = -denom, -a, -b
+    if not (0 <= a <= denom and 0 <= b <= denom):
+        return None
+    NX = s.X1 * denom + a * dx1
+    NY = s.Y1 * denom + a * dy1
+    g = gcd(gcd(NX, NY), denom)
+    return (NX // g, NY // g, denom // g)
+
+def _segments(lines):
+    coordinates = []
+    exponent = 0
+    for line in lines:
+        if not isinstance(line, Line):
+            raise InvalidLineError("Se esperaba Line")
+        values = (float(line.inicio.x), float(line.inicio.y), float(line.final.x), float(line.final.y))
+        for value in values:
+            if not isfinite(value):
+                raise SweepLineError("Las coordenadas deben ser finitas")
+            exponent = max(exponent, value.as_integer_ratio()[1].bit_length() - 1)
+        coordinates.append(values)
+    scale = 1 << exponent
+    segments = []
+    for index, values in enumerate(coordinates):
+        exact = []
+        for value in values:
+            numerator, denominator = value.as_integer_ratio()
+            exact.append(numerator * (scale // denominator))
+        segments.append(_Segment(index, values[:2], values[2:], tuple(exact[:2]), tuple(exact[2:])))
+    return segments, scale
+
+class SweepLine:
+    def __init__(self):
+        self.events_processed = 0
+        self.intersections_found = 0
+    def intersections(self, lines):
+        # [(i, j, Point)] con i < j; para solapes colineales el punto es el inicio del solape
+        segments, scale = _segments(lines)
+        heap = []
+        # punto -> (segmentos que empiezan ahi, indices de los segmentos que se sabe que pasan por ahi)
+        pending = {}
+        def push(point):
+            if point not in pending:
+                pending[point] = ([], set())
+                heappush(heap, _key(point, scale))
+            return pending[point]
+        for segment in segments:
+            push(segment.start)[0].append(segment)
+            push(segment.end)[1].add(segment.index)
+        status = _Status()
+        head = status.head
+        found = {}
+        tested = {}
+        def check(s, t, point):
+            # dos segmentos pueden volver a ser vecinos muchas veces; la interseccion se calcula una sola vez
+            pair = (s.index, t.index) if s.index < t.index else (t.index, s.index)
+            if pair in tested:
+                hit = tested[pair]
+            else:
+                hit = tested[pair] = _intersection(s, t)
+            if hit is not None and _after(hit, point):
+                push(hit)[1].update(pair)
+        processed = 0
+        while heap:
+            fpx, _, fpy, _, point = heappop(heap)
+            upper, known = pending.pop(point)
+            processed += 1
+            update, nodes = status.locate(point, fpx, fpy, known)
+            through = [node.segment for node in nodes]
+            involved = upper + through
+            if len(involved) > 1:
+                for a in range(len(involved)):
+                    for b in range(a + 1, len(involved)):
+                        i = involved[a].index
+                        j = involved[b].index
+                        pair = (i, j) if i < j else (j, i)
+                        if pair not in found:
+                            found[pair] = point
+            continuing = [segment for segment in through if segment.end != point]
+            inserted = sorted(upper + continuing, key=_Segment.order_after)
+            below = update[0]
+            status.replace(update, nodes, inserted)
+            # update[0] queda en el ultimo insertado, o en below si no se inserto nada
+            above = update[0].next[0]
+            if below is not head and below.next[0] is not None:
+                check(below.segment, below.next[0].segment, point)
+            if inserted and above is not None:
+                check(update[0].segment, above.segment, point)
+        self.events_processed = processed
+        self.intersections_found = len(found)
+        return [(i, j, Point(NX / (W * scale), NY / (W * scale))) for (i, j), (NX, NY, W) in sorted(found.items())]
+    def intersecting_pairs(self, lines):
+        return [(i, j) for i, j, point in self.intersections(lines)]
+    def __str__(self):
+        return f"SweepLine(events_processed={self.events_processed}, intersections_found={self.intersections_found})"
+
+def find_intersections(lines):
+    return SweepLine().intersections(lines)
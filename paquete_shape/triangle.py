@@ -7,30 +7,39 @@ class InvalidTriangleError(Exception):
 
 class Triangle(Shape):
     def __init__(self, edges: list = []):
-        super().__init__()
-        self.edges = edges
-        self.perimeter = 0
-        self.__area = 0
-        self.angulos = []
+        super().__init__(edges)
+    @classmethod
+    def from_points(cls, a: "Point", b: "Point", c: "Point"):
+        return cls([Line(a, b), Line(b, c), Line(c, a)])
+    @property
+    def perimeter(self):
+        return self._cached('perimeter', self._compute_perimeter)
+    @property
+    def area(self):
+        return self.compute_area()
+    @property
+    def angulos(self):
+        return self.compute_inner_angles()
+    def _compute_perimeter(self):
+        perimeter = 0
+        for edge in self.edges:
+            perimeter += edge.length
+        return perimeter
     def compute_perimeter(self):
-        if self.perimeter == 0:
-            for i in range(len(self.edges)):
-                self.edges[i].compute_length()
-                self.perimeter += self.edges[i].length
-            self.perimeter
+        return self.perimeter
     def compute_area(self):
-        if self.perimeter == 0:
-            self.compute_perimeter()
         if len(self.edges) != 3:
             raise InvalidTriangleError("Un triangulo debe tener 3 lados")
+        return self._cached('area', self._compute_area)
+    def _compute_area(self):
         semiperimetro = self.perimeter/2
-        self.area = round((semiperimetro*(semiperimetro-self.edges[0].length)*(semiperimetro-self.edges[1].length)*(semiperimetro-self.edges[2].length))**(1/2),3)
+        return round((semiperimetro*(semiperimetro-self.edges[0].length)*(semiperimetro-self.edges[1].length)*(semiperimetro-self.edges[2].length))**(1/2),3)
     def compute_inner_angles(self):
         if len(self.edges) != 3:
             raise InvalidTriangleError("Un triangulo debe tener 3 lados")
+        return list(self._cached('angulos', self._compute_inner_angles))
+    def _compute_inner_angles(self):
         angulos = []
-        for i in range(len(self.edges)):
-            self.edges[i].compute_length()
         for i in range(len(self.edges)):
             a = self.edges[i].length
             b = self.edges[i-1].length
@@ -38,7 +47,7 @@ class Triangle(Shape):
             cos_i = ((a**2 - b**2 - c**2) / (-2 * b * c))
             angulo = round(degrees(acos(cos_i)))
             angulos.append(angulo)
-        self.angulos = angulos
+        return tuple(angulos)
 
 class Isosceles(Triangle):
     definition = "Triangulo con 2 lados y angulos iguales"
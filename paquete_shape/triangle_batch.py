@@ -0,0 +1,64 @@
+from array import array
+from math import atan2, degrees, hypot
+from .triangle import Triangle, InvalidTriangleError
+
+class TriangleBatch:
+    def __init__(self, ax = (), ay = (), bx = (), by = (), cx = (), cy = ()):
+        try:
+            self.ax = array('d', ax)
+            self.ay = array('d', ay)
+            self.bx = array('d', bx)
+            self.by = array('d', by)
+            self.cx = array('d', cx)
+            self.cy = array('d', cy)
+        except Exception:
+            raise InvalidTriangleError("Coordenadas invalidas")
+        if not len(self.ax) == len(self.ay) == len(self.bx) == len(self.by) == len(self.cx) == len(self.cy):
+            raise InvalidTriangleError("Todos los arreglos de vertices deben tener la misma longitud")
+    @classmethod
+    def from_triangles(cls, triangles):
+        batch = cls()
+        for triangle in triangles:
+            if not isinstance(triangle, Triangle) or len(triangle.edges) != 3:
+                raise InvalidTriangleError("Un triangulo debe tener 3 lados")
+            a = triangle.edges[0].inicio
+            b = triangle.edges[1].inicio
+            c = triangle.edges[2].inicio
+            batch.ax.append(a.x)
+            batch.ay.append(a.y)
+            batch.bx.append(b.x)
+            batch.by.append(b.y)
+            batch.cx.append(c.x)
+            batch.cy.append(c.y)
+        return batch
+    def __len__(self):
+        return len(self.ax)
+    def compute_side_lengths(self):
+        # mismo orden que Triangle.edges: AB, BC, CA
+        ab = array('d', map(hypot, [b - a for a, b in zip(self.ax, self.bx)], [b - a for a, b in zip(self.ay, self.by)]))
+        bc = array('d', map(hypot, [c - b for b, c in zip(self.bx, self.cx)], [c - b for b, c in zip(self.by, self.cy)]))
+        ca = array('d', map(hypot, [a - c for c, a in zip(self.cx, self.ax)], [a - c for c, a in zip(self.cy, self.ay)]))
+        return ab, bc, ca
+    def compute_perimeters(self):
+        ab, bc, ca = self.compute_side_lengths()
+        return array('d', [x + y + z for x, y, z in zip(ab, bc, ca)])
+    def _cross(self):
+        return [(bx - ax) * (cy - ay) - (by - ay) * (cx - ax)
+                for ax, ay, bx, by, cx, cy in zip(self.ax, self.ay, self.bx, self.by, self.cx, self.cy)]
+    def compute_areas(self):
+        # producto cruz: sin la cancelacion de Heron en triangulos muy delgados
+        return array('d', [abs(cross) / 2 for cross in self._cross()])
+    def compute_inner_angles(self):
+        # angulo i opuesto al lado i, como Triangle.compute_inner_angles
+        crosses = [abs(cross) for cross in self._cross()]
+        vertices = ((self.cx, self.cy, self.ax, self.ay, self.bx, self.by),
+                    (self.ax, self.ay, self.bx, self.by, self.cx, self.cy),
+                    (self.bx, self.by, self.cx, self.cy, self.ax, self.ay))
+        angles = []
+        for px, py, qx, qy, rx, ry in vertices:
+            dots = [(qx_ - px_) * (rx_ - px_) + (qy_ - py_) * (ry_ - py_)
+                    for px_, py_, qx_, qy_, rx_, ry_ in zip(px, py, qx, qy, rx, ry)]
+            angles.append(array('d', [degrees(atan2(cross, dot)) for cross, dot in zip(crosses, dots)]))
+        return angles
+    def __str__(self):
+        return f"TriangleBatch(n={len(self)})"